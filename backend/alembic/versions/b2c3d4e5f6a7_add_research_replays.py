@@ -0,0 +1,37 @@
+"""add research_replays table
+
+Revision ID: b2c3d4e5f6a7
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c3d4e5f6a7"
+down_revision: str | Sequence[str] | None = "a1b2c3d4e5f6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing researches are filled in by scripts/backfill_replay_artifacts.py;
+    # until then replay falls back to rebuilding events from the node rows.
+    op.create_table(
+        "research_replays",
+        sa.Column("research_id", sa.UUID(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["research_id"], ["researches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("research_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("research_replays")
@@ -0,0 +1,51 @@
+"""add trigram indexes for fuzzy topic lookup
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d4e5f6a7b8"
+down_revision: str | Sequence[str] | None = "b2c3d4e5f6a7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEXES = (
+    ("ix_researches_topic_normalized_trgm", "topic_normalized"),
+    ("ix_researches_topic_trgm", "topic"),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Built concurrently so create_research keeps reading researches meanwhile.
+    with op.get_context().autocommit_block():
+        for name, column in _INDEXES:
+            op.create_index(
+                name,
+                "researches",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    # The pg_trgm extension is left installed; other database objects may use it.
+    with op.get_context().autocommit_block():
+        for name, _ in _INDEXES:
+            op.drop_index(
+                name,
+                table_name="researches",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,45 @@
+"""add partial index for keyset-paginated research listing
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: str | Sequence[str] | None = "c3d4e5f6a7b8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_researches_listing",
+            "researches",
+            [
+                sa.text("split_part(language, '-', 1)"),
+                sa.text("created_at DESC"),
+                sa.text("id DESC"),
+            ],
+            postgresql_where=sa.text("total_nodes > 0"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_researches_listing",
+            table_name="researches",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,37 @@
+"""add timeline_span and key_insight columns
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: str | Sequence[str] | None = "d4e5f6a7b8c9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("researches", sa.Column("timeline_span", sa.Text(), nullable=True))
+    op.add_column("researches", sa.Column("key_insight", sa.Text(), nullable=True))
+
+    # Backfill from the synthesis document; save_research keeps them in sync afterwards.
+    op.execute("""
+        UPDATE researches
+        SET timeline_span = synthesis ->> 'timeline_span',
+            key_insight = synthesis ->> 'key_insight'
+        WHERE synthesis IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("researches", "key_insight")
+    op.drop_column("researches", "timeline_span")
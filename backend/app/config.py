@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -25,6 +27,45 @@ class Settings(BaseSettings):
 
     detail_model_pool: str = ""
     detail_concurrency: int = 4
+    # 详情阶段 node_progress / node_detail 的合并窗口（毫秒，0 表示逐条发送）
+    detail_event_window_ms: int = 50
+
+    # --- 提案生成合并（同一主题+语言并发请求只调用一次 LLM；跨 worker 用 Redis 锁）---
+    proposal_lock_timeout_seconds: int = 60
+
+    # --- 跨 worker 调用配额（Redis 令牌桶，每分钟请求数，0 表示不限）---
+    llm_requests_per_minute: int = 300
+    # 按模型覆盖，格式: provider/model=每分钟请求数，逗号分隔
+    llm_rate_limits: str = ""
+    tavily_requests_per_minute: int = 100
+
+    # --- 无人观看的研究：宽限期后取消（cancel）或降为低优先级跑完入库（finish）---
+    abandoned_session_grace_seconds: int = 60
+    abandoned_session_policy: Literal["cancel", "finish"] = "cancel"
+    background_detail_concurrency: int = 1
+
+    # --- 内存会话存储（超出后回落到 Redis 恢复路径）---
+    session_max_count: int = 200
+    session_idle_ttl_seconds: int = 1800
+    session_max_bytes: int = 64 * 1024 * 1024
+
+    # --- 进程内提案/会话缓存（Redis 前的一级缓存，跨 worker 通过 pub/sub 失效）---
+    local_cache_max_entries: int = 1000
+    local_cache_ttl_seconds: int = 300
+
+    # --- Redis 中提案/会话的编码（超过阈值的值压缩存储，zstandard 可用时优先 zstd）---
+    redis_compress_threshold_bytes: int = 1024
+
+    # --- 进程内回放缓存（按字节限额的 LRU，启动时预热最常回放的研究）---
+    replay_cache_max_bytes: int = 32 * 1024 * 1024
+    replay_cache_ttl_seconds: int = 600
+    replay_cache_warm_count: int = 20
+
+    # --- 首页列表响应缓存（按版本失效；浏览器/反向代理凭 ETag 重新验证）---
+    feed_cache_control: str = "public, no-cache"
+
+    # --- SSE 传输压缩（按 Accept-Encoding 协商，逐事件 flush）---
+    sse_compression_enabled: bool = True
 
     model_config = {"env_file": ".env", "extra": "ignore"}
 
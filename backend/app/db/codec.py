@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import zlib
+
+from app.config import settings
+
+try:  # optional: better ratio and faster decode than zlib when installed
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the deployment image
+    zstandard = None
+
+# Format-version byte in front of every value written through this codec.
+FORMAT_JSON = 0x01
+FORMAT_ZLIB = 0x02
+FORMAT_ZSTD = 0x03
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3) if zstandard is not None else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+
+class CodecError(ValueError):
+    pass
+
+
+def pack(json_bytes: bytes) -> bytes:
+    """Frame compact JSON for Redis, compressing it above the size threshold."""
+    if len(json_bytes) < settings.redis_compress_threshold_bytes:
+        return bytes((FORMAT_JSON,)) + json_bytes
+    if _zstd_compressor is not None:
+        return bytes((FORMAT_ZSTD,)) + _zstd_compressor.compress(json_bytes)
+    return bytes((FORMAT_ZLIB,)) + zlib.compress(json_bytes, 6)
+
+
+def unpack(blob: bytes) -> bytes:
+    """Return the JSON bytes of a packed value; plain JSON text written before the
+    codec existed is returned unchanged."""
+    if not blob:
+        raise CodecError("empty value")
+    version, body = blob[0], blob[1:]
+    if version == FORMAT_JSON:
+        return body
+    if version == FORMAT_ZLIB:
+        return zlib.decompress(body)
+    if version == FORMAT_ZSTD:
+        if _zstd_decompressor is None:
+            raise CodecError("zstd value but the zstandard package is not installed")
+        return _zstd_decompressor.decompress(body)
+    if blob[:1] in (b"{", b"["):
+        return blob
+    raise CodecError(f"unknown format version {version:#x}")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import settings
+from app.db.local_cache import LocalCache
+
+
+@dataclass(frozen=True)
+class FeedResponse:
+    body: bytes
+    etag: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class FeedCache:
+    """Pre-encoded landing-page responses (history list, recommended topics).
+
+    ``save_research`` bumps ``version`` in the worker that wrote the row and, via
+    ``app.db.redis``, in the others. A response built while the version moved is
+    not stored, so a query that raced a save cannot cache the old result; pass
+    ``version=-1`` to encode a response that should never be stored.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self.version = 0
+        self._entries: LocalCache[tuple, FeedResponse] = LocalCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+
+    def get(self, key: tuple) -> FeedResponse | None:
+        return self._entries.get(key)
+
+    def put(
+        self, key: tuple, version: int, body: bytes, headers: dict[str, str] | None = None
+    ) -> FeedResponse:
+        # Content hash, so every worker sends the same ETag for the same bytes.
+        etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        response = FeedResponse(body, etag, headers or {})
+        if version == self.version:
+            self._entries.put(key, response)
+        return response
+
+    def bump(self) -> None:
+        self.version += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"version": self.version, **self._entries.stats()}
+
+
+feed_cache = FeedCache(max_entries=256, ttl_seconds=settings.local_cache_ttl_seconds)
@@ -3,7 +3,18 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -14,6 +25,29 @@ class Base(DeclarativeBase):
 
 class ResearchRow(Base):
     __tablename__ = "researches"
+    __table_args__ = (
+        # Trigram indexes for the fuzzy topic lookups (LIKE / ILIKE '%x%', similarity).
+        Index(
+            "ix_researches_topic_normalized_trgm",
+            "topic_normalized",
+            postgresql_using="gin",
+            postgresql_ops={"topic_normalized": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_researches_topic_trgm",
+            "topic",
+            postgresql_using="gin",
+            postgresql_ops={"topic": "gin_trgm_ops"},
+        ),
+        # Keyset pagination of the history listing, per base language.
+        Index(
+            "ix_researches_listing",
+            text("split_part(language, '-', 1)"),
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("total_nodes > 0"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     topic: Mapped[str] = mapped_column(Text, index=True)
@@ -23,6 +57,9 @@ class ResearchRow(Base):
     complexity_level: Mapped[str] = mapped_column(String(16))
     proposal: Mapped[dict] = mapped_column(JSONB)
     synthesis: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # Copied out of synthesis by save_research so the listing never reads the JSONB.
+    timeline_span: Mapped[str | None] = mapped_column(Text, nullable=True)
+    key_insight: Mapped[str | None] = mapped_column(Text, nullable=True)
     total_nodes: Mapped[int] = mapped_column(Integer, default=0)
     source_count: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now)
@@ -56,3 +93,18 @@ class TimelineNodeRow(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now)
 
     research: Mapped[ResearchRow] = relationship(back_populates="nodes")
+
+
+class ResearchReplayRow(Base):
+    """Ready-to-stream replay events of a research, compressed; see ``app.db.replay``."""
+
+    __tablename__ = "research_replays"
+
+    research_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("researches.id", ondelete="CASCADE"), primary_key=True
+    )
+    version: Mapped[int] = mapped_column(Integer)
+    payload: Mapped[bytes] = mapped_column(LargeBinary)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.now, onupdate=datetime.now
+    )
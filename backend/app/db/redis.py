@@ -1,18 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import logging
+import random
+import time
+import uuid
+from collections import OrderedDict
 from typing import Any
 
 import redis.asyncio as aioredis
+from pydantic_core import to_json
 
 from app.config import settings
+from app.db.codec import pack, unpack
+from app.db.feed_cache import feed_cache
+from app.db.local_cache import LocalCache
+from app.db.replay_cache import replay_cache
+from app.db.topic_index import cached_topic_index
+from app.models.research import ResearchProposal, SSEEventType
+from app.models.session import SessionEvent, SessionStatus
 
 logger = logging.getLogger(__name__)
 
 _redis: aioredis.Redis | None = None
+_binary_redis: aioredis.Redis | None = None
 
-PROPOSAL_TTL = 86400  # 24 hours
+# Popularity-aware proposal TTL: (hits, ttl) tiers, applied as the hit count grows.
+PROPOSAL_TTL_TIERS = ((0, 3600), (3, 6 * 3600), (10, 86400), (50, 7 * 86400))
+PROPOSAL_TTL = PROPOSAL_TTL_TIERS[0][1]
 
 
 def get_redis() -> aioredis.Redis | None:
@@ -29,46 +46,368 @@ def get_redis() -> aioredis.Redis | None:
     return _redis
 
 
+def get_binary_redis() -> aioredis.Redis | None:
+    """Connection without response decoding, for values written through ``app.db.codec``."""
+    global _binary_redis
+    if _binary_redis is not None:
+        return _binary_redis
+    if not settings.redis_url:
+        return None
+    _binary_redis = aioredis.from_url(settings.redis_url)
+    return _binary_redis
+
+
+def _text(value: bytes | str | None) -> str | None:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+# ---------- In-process cache + cross-worker invalidation ----------
+
+INVALIDATION_CHANNEL = "chrono:cache:invalidate"
+WORKER_ID = uuid.uuid4().hex[:8]
+INVALIDATION_RESUBSCRIBE_DELAY = 1
+
+proposal_cache: LocalCache[str, ResearchProposal] = LocalCache(
+    max_entries=settings.local_cache_max_entries,
+    ttl_seconds=settings.local_cache_ttl_seconds,
+)
+session_cache: LocalCache[str, dict[str, Any]] = LocalCache(
+    max_entries=settings.local_cache_max_entries,
+    ttl_seconds=settings.local_cache_ttl_seconds,
+)
+_LOCAL_CACHES: dict[str, LocalCache] = {"proposal": proposal_cache, "session": session_cache}
+
+
+def _invalidation(kind: str, key: str) -> str:
+    return f"{WORKER_ID}|{kind}|{key}"
+
+
+def handle_invalidation(message: str) -> None:
+    origin, _, rest = message.partition("|")
+    kind, _, key = rest.partition("|")
+    # The writer already updated its own entry.
+    if origin == WORKER_ID:
+        return
+    if kind in ("feeds", "cached_topic"):
+        research_id, _, normalized_topic = key.partition("|")
+        with contextlib.suppress(ValueError):
+            replay_cache.invalidate(uuid.UUID(research_id))
+        feed_cache.bump()
+        if kind == "cached_topic":
+            cached_topic_index.add(normalized_topic)
+        return
+    cache = _LOCAL_CACHES.get(kind)
+    if cache is not None:
+        cache.invalidate(key)
+
+
+async def listen_for_invalidations() -> None:
+    """Long-running task: drop local entries that another worker changed."""
+    r = get_redis()
+    if r is None:
+        return
+    resubscribing = False
+    while True:
+        try:
+            async with r.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Messages sent while we were not subscribed are lost.
+                proposal_cache.clear()
+                session_cache.clear()
+                cached_topic_index.mark_stale()
+                feed_cache.bump()
+                if resubscribing:
+                    # Kept on the first subscribe, which may race the startup warm-up.
+                    replay_cache.clear()
+                resubscribing = True
+                async for message in pubsub.listen():
+                    handle_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Redis invalidation listener failed; resubscribing", exc_info=True)
+            await asyncio.sleep(INVALIDATION_RESUBSCRIBE_DELAY)
+
+
 def _proposal_key(normalized_topic: str) -> str:
     return f"chrono:proposal:{normalized_topic}"
 
 
-async def get_cached_proposal(normalized_topic: str) -> dict[str, Any] | None:
+def _proposal_hits_key(normalized_topic: str) -> str:
+    return f"chrono:proposal_hits:{normalized_topic}"
+
+
+# Count hits and extend (never shorten) the proposal TTL to its popularity tier.
+_BUMP_PROPOSAL_TTL = """
+local hits = redis.call("INCRBY", KEYS[2], ARGV[1])
+redis.call("EXPIRE", KEYS[2], ARGV[2])
+local ttl = 0
+for i = 3, #ARGV, 2 do
+  if hits >= tonumber(ARGV[i]) then ttl = tonumber(ARGV[i + 1]) end
+end
+local current = redis.call("TTL", KEYS[1])
+if current >= 0 and current < ttl then
+  redis.call("EXPIRE", KEYS[1], ttl)
+end
+return hits
+"""
+PROPOSAL_HITS_FLUSH_SECONDS = 30
+_pending_bumps: set[asyncio.Task[None]] = set()
+# topic -> (monotonic time of the last flush, hits counted since), oldest first.
+_unflushed_hits: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+
+async def _bump_proposal_popularity(normalized_topic: str, hits: int) -> None:
     r = get_redis()
+    if r is None:
+        return
+    tiers = [value for tier in PROPOSAL_TTL_TIERS for value in tier]
+    try:
+        await r.eval(
+            _BUMP_PROPOSAL_TTL,
+            2,
+            _proposal_key(normalized_topic),
+            _proposal_hits_key(normalized_topic),
+            hits,
+            PROPOSAL_TTL_TIERS[-1][1],
+            *tiers,
+        )
+    except Exception:
+        logger.warning("Redis bump_proposal_popularity failed", exc_info=True)
+
+
+def _schedule_popularity_bump(normalized_topic: str) -> None:
+    # Hits on one topic reach Redis at most once per PROPOSAL_HITS_FLUSH_SECONDS,
+    # as a single INCRBY, so local-cache hits stay off Redis.
+    now = time.monotonic()
+    flushed_at, hits = _unflushed_hits.pop(normalized_topic, (-PROPOSAL_HITS_FLUSH_SECONDS, 0))
+    hits += 1
+    if now - flushed_at < PROPOSAL_HITS_FLUSH_SECONDS:
+        _unflushed_hits[normalized_topic] = (flushed_at, hits)
+    else:
+        _unflushed_hits[normalized_topic] = (now, 0)
+        # Off the request path: the hit is served before the counter is updated.
+        task = asyncio.create_task(_bump_proposal_popularity(normalized_topic, hits))
+        _pending_bumps.add(task)
+        task.add_done_callback(_pending_bumps.discard)
+    # Bounded like the local caches; an evicted topic loses its unflushed hits.
+    while len(_unflushed_hits) > settings.local_cache_max_entries:
+        _unflushed_hits.popitem(last=False)
+
+
+async def get_cached_proposal(normalized_topic: str) -> ResearchProposal | None:
+    proposal = proposal_cache.get(normalized_topic)
+    if proposal is not None:
+        _schedule_popularity_bump(normalized_topic)
+        return proposal
+
+    r = get_binary_redis()
     if r is None:
         return None
     try:
         raw = await r.get(_proposal_key(normalized_topic))
         if raw is None:
             return None
-        return json.loads(raw)
+        proposal = ResearchProposal.model_validate_json(unpack(raw))
     except Exception:
         logger.warning("Redis get_cached_proposal failed", exc_info=True)
         return None
+    proposal_cache.put(normalized_topic, proposal)
+    _schedule_popularity_bump(normalized_topic)
+    return proposal
+
+
+def _queue_proposal_write(pipe: Any, normalized_topic: str, packed_proposal: bytes) -> None:
+    pipe.set(_proposal_key(normalized_topic), packed_proposal, ex=PROPOSAL_TTL)
+    pipe.publish(INVALIDATION_CHANNEL, _invalidation("proposal", normalized_topic))
 
 
-async def cache_proposal(normalized_topic: str, proposal_dict: dict[str, Any]) -> None:
+async def delete_cached_proposal(normalized_topic: str) -> None:
+    proposal_cache.invalidate(normalized_topic)
     r = get_redis()
     if r is None:
         return
     try:
-        await r.set(
-            _proposal_key(normalized_topic),
-            json.dumps(proposal_dict, ensure_ascii=False),
-            ex=PROPOSAL_TTL,
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.delete(_proposal_key(normalized_topic))
+            pipe.publish(INVALIDATION_CHANNEL, _invalidation("proposal", normalized_topic))
+            await pipe.execute()
+    except Exception:
+        logger.warning("Redis delete_cached_proposal failed", exc_info=True)
+
+
+async def announce_research_saved(
+    research_id: uuid.UUID, normalized_topic: str, *, cached: bool
+) -> None:
+    """Tell the other workers a research was saved.
+
+    They drop its replay artifact and their landing feeds either way; with
+    ``cached`` the topic also counts as cached for the recommended-topic flags.
+    """
+    r = get_redis()
+    if r is None:
+        return
+    kind = "cached_topic" if cached else "feeds"
+    try:
+        await r.publish(
+            INVALIDATION_CHANNEL, _invalidation(kind, f"{research_id}|{normalized_topic}")
         )
     except Exception:
-        logger.warning("Redis cache_proposal failed", exc_info=True)
+        logger.warning("Redis announce_research_saved failed", exc_info=True)
 
 
-async def delete_cached_proposal(normalized_topic: str) -> None:
+# ---------- Proposal generation lock (one LLM call per topic across workers) ----------
+
+
+def _proposal_lock_key(flight_key: str) -> str:
+    return f"chrono:proposal_lock:{flight_key}"
+
+
+def _proposal_ready_channel(flight_key: str) -> str:
+    return f"chrono:proposal_ready:{flight_key}"
+
+
+# Delete the lock only if this worker still holds it.
+_RELEASE_PROPOSAL_LOCK = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+  return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+async def acquire_proposal_lock(flight_key: str) -> str | None:
+    """Token if this worker should generate the proposal, ``None`` if another
+    worker already is. Without Redis every worker generates its own."""
+    token = uuid.uuid4().hex
     r = get_redis()
+    if r is None:
+        return token
+    try:
+        acquired = await r.set(
+            _proposal_lock_key(flight_key),
+            token,
+            nx=True,
+            ex=settings.proposal_lock_timeout_seconds,
+        )
+    except Exception:
+        logger.warning("Redis acquire_proposal_lock failed", exc_info=True)
+        return token
+    return token if acquired else None
+
+
+async def release_proposal_lock(
+    flight_key: str,
+    token: str,
+    normalized_topic: str,
+    proposal: ResearchProposal | None,
+    *,
+    session_id: str | None = None,
+) -> None:
+    """Cache the proposal (if generation succeeded), store it as session
+    ``session_id``'s proposal, hand it to the waiting workers and release the
+    lock, in one round trip."""
+    if proposal is not None:
+        proposal_cache.put(normalized_topic, proposal)
+    if session_id is not None:
+        session_cache.invalidate(session_id)
+    r = get_binary_redis()
     if r is None:
         return
+    packed_proposal = pack(proposal.model_dump_json().encode()) if proposal is not None else b""
     try:
-        await r.delete(_proposal_key(normalized_topic))
+        async with r.pipeline(transaction=False) as pipe:
+            if proposal is not None:
+                _queue_proposal_write(pipe, normalized_topic, packed_proposal)
+                if session_id is not None:
+                    _queue_session_write(
+                        pipe,
+                        session_id,
+                        {"proposal": packed_proposal, "status": "proposal_ready"},
+                    )
+            # An empty message tells waiters to generate the proposal themselves.
+            pipe.publish(_proposal_ready_channel(flight_key), packed_proposal)
+            pipe.eval(_RELEASE_PROPOSAL_LOCK, 1, _proposal_lock_key(flight_key), token)
+            await pipe.execute()
     except Exception:
-        logger.warning("Redis delete_cached_proposal failed", exc_info=True)
+        logger.warning("Redis release_proposal_lock failed", exc_info=True)
+
+
+async def wait_for_proposal(flight_key: str, timeout: float) -> ResearchProposal | None:
+    """Wait for the worker holding the lock to publish its proposal. ``None`` if
+    it failed, timed out, or finished before we subscribed (read the cache then)."""
+    r = get_binary_redis()
+    if r is None:
+        return None
+    try:
+        async with r.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.subscribe(_proposal_ready_channel(flight_key))
+            if not await r.exists(_proposal_lock_key(flight_key)):
+                return None
+            async with asyncio.timeout(timeout):
+                async for message in pubsub.listen():
+                    if not message["data"]:
+                        return None
+                    return ResearchProposal.model_validate_json(unpack(message["data"]))
+    except TimeoutError:
+        logger.warning("Timed out waiting for proposal generation: %s", flight_key)
+    except Exception:
+        logger.warning("Redis wait_for_proposal failed", exc_info=True)
+    return None
+
+
+# ---------- Cross-worker call quotas (token buckets) ----------
+
+# Bucket capacity in seconds of quota: how large a burst an idle bucket allows.
+RATE_LIMIT_BURST_SECONDS = 10
+
+# Refill from the Redis clock so every worker sees the same time; returns 0 when a
+# token was taken, otherwise the milliseconds until one is available.
+_TAKE_TOKEN = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((1 - tokens) / rate)
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate) + 1000)
+return wait
+"""
+
+
+def _rate_limit_key(bucket: str) -> str:
+    return f"chrono:ratelimit:{bucket}"
+
+
+class RedisRateLimiter:
+    """Token bucket per bucket name shared by every worker; lets calls through
+    when Redis is not configured or unavailable."""
+
+    async def acquire(self, bucket: str, per_minute: int) -> None:
+        rate = per_minute / 60_000  # tokens per millisecond
+        capacity = max(1.0, per_minute * RATE_LIMIT_BURST_SECONDS / 60)
+        while True:
+            r = get_redis()
+            if r is None:
+                return
+            try:
+                wait_ms = await r.eval(_TAKE_TOKEN, 1, _rate_limit_key(bucket), rate, capacity)
+            except Exception:
+                logger.warning("Redis rate limit failed", exc_info=True)
+                return
+            if not wait_ms:
+                return
+            # Jitter so waiters on one bucket do not all retry in the same instant.
+            await asyncio.sleep(int(wait_ms) / 1000 + random.uniform(0, 0.05))
 
 
 # ---------- Session persistence ----------
@@ -77,9 +416,20 @@ SESSION_TTL = 86400  # 24 hours
 
 
 def _session_key(session_id: str) -> str:
+    return f"chrono:session:v2:{session_id}"
+
+
+def _legacy_session_key(session_id: str) -> str:
+    # JSON string written before sessions became hashes; readable until it expires.
     return f"chrono:session:{session_id}"
 
 
+def _queue_session_write(pipe: Any, session_id: str, fields: dict[str, bytes | str]) -> None:
+    pipe.hset(_session_key(session_id), mapping=fields)
+    pipe.expire(_session_key(session_id), SESSION_TTL)
+    pipe.publish(INVALIDATION_CHANNEL, _invalidation("session", session_id))
+
+
 async def store_session(
     session_id: str,
     proposal_dict: dict[str, Any],
@@ -87,38 +437,52 @@ async def store_session(
     *,
     cached_research_id: str | None = None,
 ) -> None:
-    r = get_redis()
+    session_cache.invalidate(session_id)
+    r = get_binary_redis()
     if r is None:
         return
+    fields: dict[str, bytes | str] = {"proposal": pack(to_json(proposal_dict)), "status": status}
+    if cached_research_id is not None:
+        fields["cached_research_id"] = cached_research_id
     try:
-        await r.set(
-            _session_key(session_id),
-            json.dumps(
-                {
-                    "proposal": proposal_dict,
-                    "status": status,
-                    "cached_research_id": cached_research_id,
-                },
-                ensure_ascii=False,
-            ),
-            ex=SESSION_TTL,
-        )
+        async with r.pipeline(transaction=False) as pipe:
+            _queue_session_write(pipe, session_id, fields)
+            await pipe.execute()
     except Exception:
         logger.warning("Redis store_session failed", exc_info=True)
 
 
 async def get_session_data(session_id: str) -> dict[str, Any] | None:
-    r = get_redis()
+    """Session record with the proposal already validated into a ``ResearchProposal``."""
+    record = session_cache.get(session_id)
+    if record is not None:
+        return dict(record)
+
+    r = get_binary_redis()
     if r is None:
         return None
     try:
-        raw = await r.get(_session_key(session_id))
-        if raw is None:
-            return None
-        return json.loads(raw)
+        fields = {_text(k): v for k, v in (await r.hgetall(_session_key(session_id))).items()}
+        if "proposal" in fields:
+            proposal = ResearchProposal.model_validate_json(unpack(fields["proposal"]))
+            data = fields
+        else:
+            raw = await r.get(_legacy_session_key(session_id))
+            if raw is None:
+                return None
+            # Status updates to a legacy session land in the new hash.
+            data = {**json.loads(unpack(raw)), **fields}
+            proposal = ResearchProposal.model_validate(data["proposal"])
+        record = {
+            "proposal": proposal,
+            "status": _text(data.get("status")),
+            "cached_research_id": _text(data.get("cached_research_id")),
+        }
     except Exception:
         logger.warning("Redis get_session_data failed", exc_info=True)
         return None
+    session_cache.put(session_id, record)
+    return dict(record)
 
 
 async def update_session_status(
@@ -127,28 +491,208 @@ async def update_session_status(
     *,
     cached_research_id: Any | None = None,
 ) -> None:
-    r = get_redis()
+    fields = {"status": status}
+    if cached_research_id is not None:
+        fields["cached_research_id"] = str(cached_research_id)
+    record = session_cache.get(session_id)
+    if record is not None:
+        session_cache.put(session_id, {**record, **fields})
+
+    r = get_binary_redis()
     if r is None:
         return
     try:
-        raw = await r.get(_session_key(session_id))
-        if raw is None:
-            return
-        data = json.loads(raw)
-        data["status"] = status
-        if cached_research_id is not None:
-            data["cached_research_id"] = str(cached_research_id)
-        await r.set(
-            _session_key(session_id),
-            json.dumps(data, ensure_ascii=False),
-            ex=SESSION_TTL,
-        )
+        async with r.pipeline(transaction=False) as pipe:
+            _queue_session_write(pipe, session_id, fields)
+            await pipe.execute()
     except Exception:
         logger.warning("Redis update_session_status failed", exc_info=True)
 
 
+# ---------- Session event streams ----------
+
+EVENTS_MAXLEN = 20000
+EVENTS_CLOSED_TTL = 3600  # completed runs are replayed from Postgres afterwards
+
+
+def _events_key(session_id: str) -> str:
+    return f"chrono:events:{session_id}"
+
+
+class RedisSessionEventSink:
+    """Mirrors live session events into a Redis stream so any worker can tail them."""
+
+    async def append(self, session_id: str, epoch: str, event: SessionEvent) -> None:
+        r = get_redis()
+        if r is None:
+            return
+        try:
+            async with r.pipeline(transaction=False) as pipe:
+                pipe.xadd(
+                    _events_key(session_id),
+                    {
+                        "epoch": epoch,
+                        "seq": event.seq,
+                        "type": event.event_type.value,
+                        "key": event.key or "",
+                        "frame": event.frame.decode(),
+                    },
+                    maxlen=EVENTS_MAXLEN,
+                    approximate=True,
+                )
+                pipe.expire(_events_key(session_id), SESSION_TTL)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Redis append_session_event failed", exc_info=True)
+
+    async def close(self, session_id: str, epoch: str, status: SessionStatus) -> None:
+        r = get_redis()
+        if r is None:
+            return
+        try:
+            async with r.pipeline(transaction=False) as pipe:
+                pipe.xadd(_events_key(session_id), {"epoch": epoch, "end": status.value})
+                pipe.expire(_events_key(session_id), EVENTS_CLOSED_TTL)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Redis close_session_events failed", exc_info=True)
+
+
+async def reset_session_events(session_id: str) -> None:
+    """Drop a previous run's stream before the session starts a new live run."""
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        await r.delete(_events_key(session_id))
+    except Exception:
+        logger.warning("Redis reset_session_events failed", exc_info=True)
+
+
+async def get_session_events_tail(session_id: str) -> tuple[str, float, bool] | None:
+    """Return (epoch, seconds since the last entry, ended) for a session stream."""
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        entries = await r.xrevrange(_events_key(session_id), count=1)
+        if not entries:
+            return None
+        entry_id, fields = entries[0]
+        age = time.time() - int(entry_id.split("-", 1)[0]) / 1000
+        return fields["epoch"], age, "end" in fields
+    except Exception:
+        logger.warning("Redis get_session_events_tail failed", exc_info=True)
+        return None
+
+
+async def read_session_events(
+    session_id: str,
+    last_id: str,
+    *,
+    epoch: str,
+    block_ms: int,
+    count: int = 500,
+) -> tuple[str, list[SessionEvent], SessionStatus | None] | None:
+    """Blocking read of entries after ``last_id`` that belong to run ``epoch``.
+
+    Returns the new last id, the decoded events and the final status once the
+    end marker has been read. Returns None if Redis is unavailable.
+    """
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        response = await r.xread({_events_key(session_id): last_id}, count=count, block=block_ms)
+    except Exception:
+        logger.warning("Redis read_session_events failed", exc_info=True)
+        return None
+
+    events: list[SessionEvent] = []
+    for _stream, entries in response or []:
+        for entry_id, fields in entries:
+            last_id = entry_id
+            if fields.get("epoch") != epoch:
+                continue
+            if "end" in fields:
+                return last_id, events, SessionStatus(fields["end"])
+            events.append(
+                SessionEvent(
+                    SSEEventType(fields["type"]),
+                    fields["frame"].encode(),
+                    seq=int(fields["seq"]),
+                    key=fields["key"] or None,
+                )
+            )
+    return last_id, events, None
+
+
+# ---------- Cross-worker session watchers ----------
+
+SESSION_WATCHER_TTL = 30
+
+
+def _watchers_key(session_id: str) -> str:
+    return f"chrono:watchers:{session_id}"
+
+
+async def touch_session_watcher(session_id: str) -> None:
+    """Record that this worker has a client following the session's run."""
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.zadd(_watchers_key(session_id), {WORKER_ID: time.time() + SESSION_WATCHER_TTL})
+            pipe.expire(_watchers_key(session_id), SESSION_WATCHER_TTL)
+            await pipe.execute()
+    except Exception:
+        logger.warning("Redis touch_session_watcher failed", exc_info=True)
+
+
+async def count_session_watchers(session_id: str) -> int:
+    """Workers whose watcher heartbeat for the session has not expired."""
+    r = get_redis()
+    if r is None:
+        return 0
+    try:
+        return await r.zcount(_watchers_key(session_id), time.time(), "+inf")
+    except Exception:
+        logger.warning("Redis count_session_watchers failed", exc_info=True)
+        return 0
+
+
+# ---------- Replay popularity ----------
+
+REPLAY_COUNTS_KEY = "chrono:replay_counts"
+
+
+async def record_research_replay(research_id: str) -> None:
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        await r.zincrby(REPLAY_COUNTS_KEY, 1, research_id)
+    except Exception:
+        logger.warning("Redis record_research_replay failed", exc_info=True)
+
+
+async def get_most_replayed_research_ids(limit: int) -> list[str]:
+    r = get_redis()
+    if r is None:
+        return []
+    try:
+        return await r.zrevrange(REPLAY_COUNTS_KEY, 0, limit - 1)
+    except Exception:
+        logger.warning("Redis get_most_replayed_research_ids failed", exc_info=True)
+        return []
+
+
 async def close_redis() -> None:
-    global _redis
+    global _redis, _binary_redis
     if _redis is not None:
         await _redis.aclose()
         _redis = None
+    if _binary_redis is not None:
+        await _binary_redis.aclose()
+        _binary_redis = None
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
+import zlib
+from types import SimpleNamespace
 from typing import Any
 
-from app.db.redis import update_session_status
+from app.db.redis import (
+    get_most_replayed_research_ids,
+    record_research_replay,
+    update_session_status,
+)
+from app.db.replay_cache import replay_cache
+from app.models.research import ResearchProposal, SSEEventType
 from app.models.runtime import RuntimeTimelineNode
-from app.models.session import ResearchSession, SessionStatus
+from app.models.session import ResearchSession, SessionEvent, SessionStatus
 from app.sse.event_publisher import (
     push_complete,
     push_node_detail,
@@ -13,10 +22,81 @@ from app.sse.event_publisher import (
     push_synthesis,
 )
 
+# Bump whenever the replay event sequence or payload schema changes; artifacts
+# stored under an older version are ignored and rebuilt by the backfill script.
+REPLAY_ARTIFACT_VERSION = 1
+REPLAY_ARTIFACT_LEVEL = 6
+
+
+def replay_epoch(artifact: bytes) -> str:
+    """Epoch of a replay: every worker streaming this artifact hands out the same
+    event ids, while a re-run that rewrote the research (or a new artifact
+    version) gets new ones, so a stale ``Last-Event-ID`` restarts at offset 0."""
+    return f"r{REPLAY_ARTIFACT_VERSION}{hashlib.blake2b(artifact, digest_size=5).hexdigest()}"
+
+
+async def prepare_replay(session: ResearchSession, research_id: uuid.UUID) -> bytes:
+    """Load the artifact to replay and take the session epoch from it.
+
+    Runs before the stream resolves ``Last-Event-ID``, which needs the epoch.
+    """
+    artifact = replay_cache.get(research_id)
+    if artifact is None:
+        artifact = await _load_replay_artifact(research_id)
+        if artifact is None:
+            research, node_rows = await _load_research_snapshot(research_id)
+            scratch = ResearchSession("replay-artifact", session.proposal)
+            await _push_research_events(scratch, research, node_rows)
+            artifact = encode_replay_artifact(scratch.history)
+        # Only on a miss: re-putting a hit would turn the TTL into a sliding one.
+        replay_cache.put(research_id, artifact)
+    if not session.has_events:
+        session.epoch = replay_epoch(artifact)
+    return artifact
+
+
+async def replay_research(
+    session: ResearchSession,
+    research_id: uuid.UUID,
+    artifact: bytes | None = None,
+) -> None:
+    await record_research_replay(str(research_id))
+    if artifact is None:
+        artifact = await prepare_replay(session, research_id)
+    events = decode_replay_artifact(
+        artifact,
+        epoch=session.epoch,
+        first_seq=len(session.history) + 1,
+    )
+    await session.append_events(events)
+    await _finish_replay(session)
+
+
+async def warm_replay_cache(limit: int) -> int:
+    """Preload artifacts of the most replayed researches into ``replay_cache``."""
+    from app.db.database import async_session_factory
+    from app.db.repository import get_replay_artifact
+
+    if async_session_factory is None or limit <= 0:
+        return 0
+    warmed = 0
+    async with async_session_factory() as db:
+        for raw_id in await get_most_replayed_research_ids(limit):
+            research_id = uuid.UUID(raw_id)
+            artifact = await get_replay_artifact(db, research_id, version=REPLAY_ARTIFACT_VERSION)
+            if artifact is not None:
+                replay_cache.put(research_id, artifact)
+                warmed += 1
+    return warmed
+
+
+async def _load_replay_artifact(research_id: uuid.UUID) -> bytes | None:
+    from app.db.database import async_session_factory
+    from app.db.repository import get_replay_artifact
 
-async def replay_research(session: ResearchSession, research_id: uuid.UUID) -> None:
-    research, node_rows = await _load_research_snapshot(research_id)
-    await _emit_research_replay(session, research, node_rows)
+    assert async_session_factory is not None
+    async with async_session_factory() as db:
+        return await get_replay_artifact(db, research_id, version=REPLAY_ARTIFACT_VERSION)
 
 
 async def _load_research_snapshot(research_id: uuid.UUID) -> tuple[Any, list[Any]]:
@@ -36,7 +116,7 @@ async def _load_research_snapshot(research_id: uuid.UUID) -> tuple[Any, list[Any
     return research, node_rows
 
 
-async def _emit_research_replay(
+async def _push_research_events(
     session: ResearchSession,
     research: Any,
     node_rows: list[Any],
@@ -72,6 +152,9 @@ async def _emit_research_replay(
         total_nodes=research.total_nodes,
         detail_completed=research.total_nodes,
     )
+
+
+async def _finish_replay(session: ResearchSession) -> None:
     session.status = SessionStatus.COMPLETED
     await update_session_status(
         session.session_id,
@@ -79,3 +162,51 @@ async def _emit_research_replay(
         cached_research_id=session.cached_research_id,
     )
     await session.close()
+
+
+async def build_replay_artifact(
+    proposal: ResearchProposal,
+    *,
+    synthesis: dict | None,
+    total_nodes: int,
+    node_rows: list[Any],
+) -> bytes:
+    """Run the replay event sequence once into a scratch session and pack it."""
+    scratch = ResearchSession("replay-artifact", proposal)
+    research = SimpleNamespace(synthesis=synthesis, total_nodes=total_nodes)
+    await _push_research_events(scratch, research, node_rows)
+    return encode_replay_artifact(scratch.history)
+
+
+def encode_replay_artifact(events: list[SessionEvent]) -> bytes:
+    """Pack events as zlib-compressed ``type\\tkey\\tdata`` lines.
+
+    ``data`` is the compact JSON payload, which never contains a raw tab or
+    newline, so replaying only has to split lines and frame them.
+    """
+    lines = b"".join(
+        b"%s\t%s\t%s\n" % (event.event_type.value.encode(), (event.key or "").encode(), event.data)
+        for event in events
+    )
+    return zlib.compress(lines, REPLAY_ARTIFACT_LEVEL)
+
+
+def decode_replay_artifact(
+    artifact: bytes,
+    *,
+    epoch: str,
+    first_seq: int = 1,
+) -> list[SessionEvent]:
+    events: list[SessionEvent] = []
+    for seq, line in enumerate(zlib.decompress(artifact).split(b"\n")[:-1], start=first_seq):
+        event_type, key, data = line.split(b"\t", 2)
+        events.append(
+            SessionEvent.from_data(
+                SSEEventType(event_type.decode()),
+                data,
+                seq=seq,
+                epoch=epoch,
+                key=key.decode() or None,
+            )
+        )
+    return events
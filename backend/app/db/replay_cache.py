@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayCache:
+    """Process-level LRU of replay artifacts keyed by research id, bounded by bytes.
+
+    ``save_research`` invalidates the entry in the worker that wrote the row and,
+    via ``app.db.redis``, in the others; the TTL only bounds staleness if one of
+    those messages is missed.
+    """
+
+    def __init__(self, *, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[uuid.UUID, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, research_id: uuid.UUID) -> bytes | None:
+        entry = self._entries.get(research_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        artifact, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self.invalidate(research_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(research_id)
+        self.hits += 1
+        return artifact
+
+    def put(self, research_id: uuid.UUID, artifact: bytes) -> None:
+        if len(artifact) > self.max_bytes:
+            return
+        self.invalidate(research_id)
+        self._entries[research_id] = (artifact, time.monotonic())
+        self._bytes += len(artifact)
+        while self._bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def invalidate(self, research_id: uuid.UUID) -> None:
+        entry = self._entries.pop(research_id, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+replay_cache = ReplayCache(
+    max_bytes=settings.replay_cache_max_bytes,
+    ttl_seconds=settings.replay_cache_ttl_seconds,
+)
@@ -1,25 +1,45 @@
 from __future__ import annotations
 
+import base64
+import logging
 import uuid
 from datetime import datetime
+from types import SimpleNamespace
 
-from sqlalchemy import delete, literal, or_, select, update
+from sqlalchemy import delete, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import ResearchRow, TimelineNodeRow
+from app.db.feed_cache import feed_cache
+from app.db.models import ResearchReplayRow, ResearchRow, TimelineNodeRow
+from app.db.redis import announce_research_saved
+from app.db.replay import REPLAY_ARTIFACT_VERSION, build_replay_artifact
+from app.db.replay_cache import replay_cache
+from app.db.topic_index import cached_topic_index
 from app.models.research import ResearchProposal
 from app.utils.topic import normalize_topic
 
+logger = logging.getLogger(__name__)
+
 _LIKE_ESCAPE = str.maketrans({"%": "\\%", "_": "\\_"})
 
 
 def _topic_fuzzy_conditions(topic: str, normalized: str):
+    # Both predicates are served by the pg_trgm GIN indexes on these columns.
     return or_(
         ResearchRow.topic_normalized.contains(normalized),
         ResearchRow.topic.ilike(f"%{topic.strip().translate(_LIKE_ESCAPE)}%", escape="\\"),
     )
 
 
+def _topic_fuzzy_order(normalized: str):
+    # Closest topic first; among equally close ones, the newest.
+    return (
+        func.similarity(ResearchRow.topic_normalized, normalized).desc(),
+        ResearchRow.created_at.desc(),
+    )
+
+
 async def get_research_by_topic(session: AsyncSession, topic: str) -> ResearchRow | None:
     normalized = normalize_topic(topic)
     # Exact match first
@@ -32,7 +52,8 @@ async def get_research_by_topic(session: AsyncSession, topic: str) -> ResearchRo
     stmt = (
         select(ResearchRow)
         .where(_topic_fuzzy_conditions(topic, normalized))
-        .order_by(ResearchRow.created_at.desc())
+        .order_by(*_topic_fuzzy_order(normalized))
+        .limit(1)
     )
     result = await session.execute(stmt)
     return result.scalars().first()
@@ -50,7 +71,8 @@ async def get_research_id_by_topic(session: AsyncSession, topic: str) -> uuid.UU
     stmt = (
         select(ResearchRow.id)
         .where(_topic_fuzzy_conditions(topic, normalized))
-        .order_by(ResearchRow.created_at.desc())
+        .order_by(*_topic_fuzzy_order(normalized))
+        .limit(1)
     )
     result = await session.execute(stmt)
     return result.scalars().first()
@@ -69,7 +91,8 @@ async def get_cached_research_proposal_by_topic(session: AsyncSession, topic: st
     stmt = (
         select(*selected_columns)
         .where(_topic_fuzzy_conditions(topic, normalized))
-        .order_by(ResearchRow.created_at.desc())
+        .order_by(*_topic_fuzzy_order(normalized))
+        .limit(1)
     )
     result = await session.execute(stmt)
     return result.first()
@@ -134,11 +157,77 @@ async def get_nodes_for_research_replay(session: AsyncSession, research_id: uuid
     return list(result.all())
 
 
+async def get_replay_artifact(
+    session: AsyncSession, research_id: uuid.UUID, *, version: int
+) -> bytes | None:
+    stmt = select(ResearchReplayRow.payload).where(
+        ResearchReplayRow.research_id == research_id,
+        ResearchReplayRow.version == version,
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def save_replay_artifact(
+    session: AsyncSession, research_id: uuid.UUID, *, version: int, payload: bytes
+) -> None:
+    stmt = insert(ResearchReplayRow).values(
+        research_id=research_id,
+        version=version,
+        payload=payload,
+        updated_at=datetime.now(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ResearchReplayRow.research_id],
+        set_={
+            "version": stmt.excluded.version,
+            "payload": stmt.excluded.payload,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def list_researches_without_replay_artifact(
+    session: AsyncSession, *, version: int, limit: int
+):
+    stmt = (
+        select(
+            ResearchRow.id,
+            ResearchRow.proposal,
+            ResearchRow.synthesis,
+            ResearchRow.total_nodes,
+        )
+        .outerjoin(ResearchReplayRow, ResearchReplayRow.research_id == ResearchRow.id)
+        .where(or_(ResearchReplayRow.research_id.is_(None), ResearchReplayRow.version != version))
+        .order_by(ResearchRow.created_at)
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return list(result.all())
+
+
+def encode_research_cursor(created_at: datetime, research_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{research_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_research_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of ``encode_research_cursor``; raises ``ValueError`` if malformed."""
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    created_at, _, research_id = raw.partition("|")
+    return datetime.fromisoformat(created_at), uuid.UUID(research_id)
+
+
 async def list_researches(
-    session: AsyncSession, *, locale: str | None = None, limit: int | None = None
+    session: AsyncSession,
+    *,
+    locale: str | None = None,
+    limit: int | None = None,
+    after: tuple[datetime, uuid.UUID] | None = None,
 ):
-    timeline_span = ResearchRow.synthesis["timeline_span"].as_string().label("timeline_span")
-    key_insight = ResearchRow.synthesis["key_insight"].as_string().label("key_insight")
+    """Newest first; ``after`` is the (created_at, id) of the last row of the
+    previous page. Served by the partial ``ix_researches_listing`` index."""
     stmt = (
         select(
             ResearchRow.id,
@@ -149,14 +238,16 @@ async def list_researches(
             ResearchRow.total_nodes,
             ResearchRow.source_count,
             ResearchRow.created_at,
-            timeline_span,
-            key_insight,
+            ResearchRow.timeline_span,
+            ResearchRow.key_insight,
         )
         .where(ResearchRow.total_nodes > 0)
-        .order_by(ResearchRow.created_at.desc())
+        .order_by(ResearchRow.created_at.desc(), ResearchRow.id.desc())
     )
     if locale:
-        stmt = stmt.where(ResearchRow.language.like(f"{locale}%"))
+        stmt = stmt.where(func.split_part(ResearchRow.language, "-", 1) == locale)
+    if after is not None:
+        stmt = stmt.where(tuple_(ResearchRow.created_at, ResearchRow.id) < tuple_(*after))
     if limit is not None:
         stmt = stmt.limit(limit)
     result = await session.execute(stmt)
@@ -166,11 +257,7 @@ async def list_researches(
 async def list_cached_topic_normalized(
     session: AsyncSession, *, candidates: set[str] | None = None
 ) -> list[str]:
-    stmt = (
-        select(ResearchRow.topic_normalized)
-        .where(ResearchRow.total_nodes > 0)
-        .order_by(ResearchRow.created_at.desc())
-    )
+    stmt = select(ResearchRow.topic_normalized).where(ResearchRow.total_nodes > 0)
     if candidates is not None:
         if not candidates:
             return []
@@ -187,6 +274,35 @@ async def list_cached_topic_normalized(
     return list(result.scalars().all())
 
 
+# Rows per INSERT statement, well below the 32767 bind parameters asyncpg allows.
+NODE_INSERT_BATCH = 500
+_NODE_CONTENT_COLUMNS = (
+    "date",
+    "title",
+    "subtitle",
+    "significance",
+    "description",
+    "details",
+    "is_gap_node",
+    "phase_name",
+    "sort_order",
+)
+
+
+async def _upsert_nodes(session: AsyncSession, node_rows: list[dict]) -> None:
+    """Multi-row upsert that only rewrites nodes whose content changed."""
+    for start in range(0, len(node_rows), NODE_INSERT_BATCH):
+        stmt = insert(TimelineNodeRow).values(node_rows[start : start + NODE_INSERT_BATCH])
+        current = tuple_(*(TimelineNodeRow.__table__.c[name] for name in _NODE_CONTENT_COLUMNS))
+        incoming = tuple_(*(stmt.excluded[name] for name in _NODE_CONTENT_COLUMNS))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TimelineNodeRow.research_id, TimelineNodeRow.node_id],
+            set_={name: stmt.excluded[name] for name in _NODE_CONTENT_COLUMNS},
+            where=current.is_distinct_from(incoming),
+        )
+        await session.execute(stmt)
+
+
 async def save_research(
     session: AsyncSession,
     *,
@@ -197,60 +313,81 @@ async def save_research(
     source_count: int,
 ) -> uuid.UUID:
     existing_id = await get_research_id_by_topic(session, proposal.topic)
+    values = {
+        "topic_normalized": normalize_topic(proposal.topic),
+        "topic_type": proposal.topic_type.value,
+        "language": proposal.language,
+        "complexity_level": proposal.complexity.level.value,
+        "proposal": proposal.model_dump(),
+        "synthesis": synthesis_data,
+        "timeline_span": (synthesis_data or {}).get("timeline_span"),
+        "key_insight": (synthesis_data or {}).get("key_insight"),
+        "total_nodes": total_nodes,
+        "source_count": source_count,
+        "updated_at": datetime.now(),
+    }
 
     if existing_id:
+        research_id = existing_id
+        await session.execute(
+            update(ResearchRow).where(ResearchRow.id == research_id).values(**values)
+        )
+    else:
+        research_id = uuid.uuid4()
         await session.execute(
-            update(ResearchRow)
-            .where(ResearchRow.id == existing_id)
-            .values(
-                topic_normalized=normalize_topic(proposal.topic),
-                topic_type=proposal.topic_type.value,
-                language=proposal.language,
-                complexity_level=proposal.complexity.level.value,
-                proposal=proposal.model_dump(),
-                synthesis=synthesis_data,
-                total_nodes=total_nodes,
-                source_count=source_count,
-                updated_at=datetime.now(),
+            insert(ResearchRow).values(
+                id=research_id, topic=proposal.topic, created_at=datetime.now(), **values
             )
         )
-        # Delete old nodes
+
+    node_rows = [
+        {
+            "research_id": research_id,
+            "node_id": node["id"],
+            "date": node["date"],
+            "title": node["title"],
+            "subtitle": node.get("subtitle", ""),
+            "significance": node["significance"],
+            "description": node["description"],
+            "details": node.get("details"),
+            "is_gap_node": node.get("is_gap_node", False),
+            "phase_name": node.get("phase_name"),
+            "sort_order": i,
+        }
+        for i, node in enumerate(nodes)
+    ]
+    await _upsert_nodes(session, node_rows)
+    if existing_id:
         await session.execute(
-            delete(TimelineNodeRow).where(TimelineNodeRow.research_id == existing_id)
+            delete(TimelineNodeRow).where(
+                TimelineNodeRow.research_id == research_id,
+                TimelineNodeRow.node_id.not_in([row["node_id"] for row in node_rows]),
+            )
         )
-        await session.flush()
-        research_id = existing_id
-    else:
-        research = ResearchRow(
-            topic=proposal.topic,
-            topic_normalized=normalize_topic(proposal.topic),
-            topic_type=proposal.topic_type.value,
-            language=proposal.language,
-            complexity_level=proposal.complexity.level.value,
-            proposal=proposal.model_dump(),
+
+    # Written in the same transaction, so an overwritten research never keeps a
+    # stale artifact. Without one, replay rebuilds the events from the node rows.
+    try:
+        artifact = await build_replay_artifact(
+            proposal,
             synthesis=synthesis_data,
             total_nodes=total_nodes,
-            source_count=source_count,
+            node_rows=[SimpleNamespace(**row) for row in node_rows],
         )
-        session.add(research)
-        await session.flush()
-        research_id = research.id
-
-    for i, node in enumerate(nodes):
-        row = TimelineNodeRow(
-            research_id=research_id,
-            node_id=node["id"],
-            date=node["date"],
-            title=node["title"],
-            subtitle=node.get("subtitle", ""),
-            significance=node["significance"],
-            description=node["description"],
-            details=node.get("details"),
-            is_gap_node=node.get("is_gap_node", False),
-            phase_name=node.get("phase_name"),
-            sort_order=i,
+    except Exception:
+        logger.warning("Failed to build replay artifact for %s", research_id, exc_info=True)
+        await session.execute(
+            delete(ResearchReplayRow).where(ResearchReplayRow.research_id == research_id)
+        )
+    else:
+        await save_replay_artifact(
+            session, research_id, version=REPLAY_ARTIFACT_VERSION, payload=artifact
         )
-        session.add(row)
 
     await session.commit()
+    replay_cache.invalidate(research_id)
+    feed_cache.bump()
+    if total_nodes > 0:
+        cached_topic_index.add(values["topic_normalized"])
+    await announce_research_saved(research_id, values["topic_normalized"], cached=total_nodes > 0)
     return research_id
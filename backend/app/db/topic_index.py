@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.data.recommended import RECOMMENDED_TOPICS
+from app.utils.topic import normalize_topic
+from app.utils.topic_matcher import CachedTopicMatcher
+
+
+class CachedTopicIndex:
+    """Process-level view of which recommended topics already have a research.
+
+    Loaded from Postgres once, then kept current by ``save_research`` in this
+    worker and by ``cached_topic`` messages from the others (``app.db.redis``).
+    It is only reloaded when the invalidation listener resubscribes, since
+    messages sent while it was disconnected are lost.
+    """
+
+    def __init__(self, candidates: set[str]) -> None:
+        self.matcher = CachedTopicMatcher(candidates)
+        self.loaded = False
+        # Topics added while a load is running, re-applied after it resets the matcher.
+        self._added_during_load: list[str] | None = None
+        self._lock = asyncio.Lock()
+
+    def mark_stale(self) -> None:
+        self.loaded = False
+
+    def add(self, normalized_topic: str) -> None:
+        self.matcher.add(normalized_topic)
+        if self._added_during_load is not None:
+            self._added_during_load.append(normalized_topic)
+
+    async def covered(self, candidates: set[str]) -> set[str]:
+        if not self.loaded:
+            async with self._lock:
+                if not self.loaded:
+                    await self._load()
+        return self.matcher.covered(candidates)
+
+    async def _load(self) -> None:
+        from app.db.database import async_session_factory
+        from app.db.repository import list_cached_topic_normalized
+
+        if async_session_factory is None:
+            return
+        self._added_during_load = []
+        try:
+            async with async_session_factory() as db:
+                topics = await list_cached_topic_normalized(db)
+            self.matcher.reset([*topics, *self._added_during_load])
+        finally:
+            self._added_during_load = None
+        self.loaded = True
+
+
+def _recommended_candidates() -> set[str]:
+    return {
+        normalize_topic(topic["title"])
+        for categories in RECOMMENDED_TOPICS.values()
+        for category in categories
+        for topic in category["topics"]
+    }
+
+
+cached_topic_index = CachedTopicIndex(_recommended_candidates())
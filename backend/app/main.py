@@ -1,29 +1,43 @@
-import copy
+import asyncio
 import logging
 import os
 import uuid
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
+from pydantic_core import to_json
 from sqlalchemy import text
 
 from app.agents.similar_topic import find_similar_topic
+from app.config import settings
 from app.data.recommended import RECOMMENDED_TOPICS
 from app.db.database import async_session_factory, engine
+from app.db.feed_cache import FeedResponse, feed_cache
 from app.db.redis import (
-    cache_proposal,
+    RedisRateLimiter,
+    RedisSessionEventSink,
+    acquire_proposal_lock,
     close_redis,
     get_cached_proposal,
     get_redis,
+    listen_for_invalidations,
+    proposal_cache,
+    release_proposal_lock,
+    session_cache,
     store_session,
+    wait_for_proposal,
 )
+from app.db.replay import warm_replay_cache
+from app.db.replay_cache import replay_cache
 from app.db.repository import (
+    decode_research_cursor,
+    encode_research_cursor,
     get_cached_research_proposal_by_topic,
-    list_cached_topic_normalized,
     list_researches,
     list_topic_candidates,
 )
+from app.db.topic_index import cached_topic_index
 from app.models.research import (
     ErrorResponse,
     ResearchProposal,
@@ -33,9 +47,11 @@ from app.models.research import (
 )
 from app.models.session import SessionManager
 from app.orchestrator.orchestrator import Orchestrator
+from app.services.rate_limit import rate_limit_stats, set_rate_limiter
 from app.services.tavily import TavilyService
 from app.session.lifecycle import SessionLifecycleService
 from app.session.replay_session import create_replay_session_for_research
+from app.utils.single_flight import SingleFlight
 from app.utils.topic import normalize_topic
 
 logger = logging.getLogger(__name__)
@@ -46,9 +62,22 @@ RESEARCH_MAINTENANCE_ERROR = ErrorResponse(
 )
 
 
+async def _warm_replay_cache() -> None:
+    try:
+        warmed = await warm_replay_cache(settings.replay_cache_warm_count)
+        logger.info("Warmed replay cache with %d researches", warmed)
+    except Exception:
+        logger.warning("Replay cache warm-up failed", exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # 预热在后台进行，不阻塞启动
+    warm_task = asyncio.create_task(_warm_replay_cache())
+    invalidation_task = asyncio.create_task(listen_for_invalidations())
     yield
+    warm_task.cancel()
+    invalidation_task.cancel()
     await close_redis()
     if engine is not None:
         await engine.dispose()
@@ -63,10 +92,47 @@ app = FastAPI(
     redoc_url="/redoc" if _enable_docs else None,
     openapi_url="/openapi.json" if _enable_docs else None,
 )
+set_rate_limiter(RedisRateLimiter())
 tavily_service = TavilyService()
-session_manager = SessionManager()
+session_manager = SessionManager(
+    max_sessions=settings.session_max_count,
+    idle_ttl_seconds=settings.session_idle_ttl_seconds,
+    max_bytes=settings.session_max_bytes,
+    event_sink=RedisSessionEventSink(),
+)
 orchestrator = Orchestrator(tavily=tavily_service)
 lifecycle_service = SessionLifecycleService(session_manager)
+proposal_flights: SingleFlight[ResearchProposal] = SingleFlight()
+
+
+async def _generate_proposal(
+    request: ResearchRequest, normalized: str, flight_key: str, session_id: str
+) -> ResearchProposal:
+    """Generate a proposal unless another worker already is, then reuse its result.
+
+    Either way session ``session_id`` is stored with the proposal; a fresh one is
+    written in the same round trip that releases the lock.
+    """
+    token = await acquire_proposal_lock(flight_key)
+    if token is None:
+        proposal = await wait_for_proposal(flight_key, settings.proposal_lock_timeout_seconds)
+        if proposal is None:
+            proposal = await get_cached_proposal(normalized)
+        if proposal is not None:
+            logger.info("Reused proposal generated by another worker: %s", request.topic)
+            await store_session(session_id, proposal.model_dump(), "proposal_ready")
+            return proposal
+        # The other worker failed or timed out; generate without the lock.
+        token = ""
+
+    try:
+        proposal = await orchestrator.create_proposal(request)
+    except BaseException:
+        if token:
+            await release_proposal_lock(flight_key, token, normalized, None)
+        raise
+    await release_proposal_lock(flight_key, token, normalized, proposal, session_id=session_id)
+    return proposal
 
 
 @app.get("/health")
@@ -102,34 +168,72 @@ async def health_check() -> JSONResponse:
             "status": "healthy" if healthy else "unhealthy",
             "service": "chrono-backend",
             "checks": checks,
+            "sessions": session_manager.stats(),
+            "replay_cache": replay_cache.stats(),
+            "feed_cache": feed_cache.stats(),
+            "rate_limits": rate_limit_stats(),
+            "local_cache": {
+                "proposals": proposal_cache.stats(),
+                "sessions": session_cache.stats(),
+            },
         },
     )
 
 
+def _feed_response(request: Request, feed: FeedResponse) -> Response:
+    headers = {"ETag": feed.etag, "Cache-Control": settings.feed_cache_control, **feed.headers}
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if feed.etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+    return Response(feed.body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/researches")
 async def list_researches_endpoint(
+    request: Request,
     locale: str | None = None,
     limit: int = Query(50, ge=1, le=100),
-):
-    if async_session_factory is None:
-        return []
-    async with async_session_factory() as db:
-        rows = await list_researches(db, locale=locale, limit=limit)
-    return [
-        {
-            "id": str(row.id),
-            "topic": row.topic,
-            "topic_type": row.topic_type,
-            "language": row.language,
-            "complexity_level": row.complexity_level,
-            "total_nodes": row.total_nodes,
-            "source_count": row.source_count,
-            "created_at": row.created_at.isoformat(),
-            "timeline_span": row.timeline_span or "",
-            "key_insight": row.key_insight or "",
-        }
-        for row in rows
-    ]
+    cursor: str | None = None,
+) -> Response:
+    """Newest first. When more rows exist, ``X-Next-Cursor`` holds the value to
+    pass as ``cursor`` for the next page. First pages are served from ``feed_cache``."""
+    try:
+        after = decode_research_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    key = ("researches", locale, limit)
+    feed = feed_cache.get(key) if after is None else None
+    if feed is None:
+        # Only first pages are cached; deeper pages are rarely shared between clients.
+        version = feed_cache.version if after is None else -1
+        rows = []
+        if async_session_factory is not None:
+            async with async_session_factory() as db:
+                rows = await list_researches(db, locale=locale, limit=limit + 1, after=after)
+        headers: dict[str, str] = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_research_cursor(rows[-1].created_at, rows[-1].id)
+        body = to_json(
+            [
+                {
+                    "id": str(row.id),
+                    "topic": row.topic,
+                    "topic_type": row.topic_type,
+                    "language": row.language,
+                    "complexity_level": row.complexity_level,
+                    "total_nodes": row.total_nodes,
+                    "source_count": row.source_count,
+                    "created_at": row.created_at.isoformat(),
+                    "timeline_span": row.timeline_span or "",
+                    "key_insight": row.key_insight or "",
+                }
+                for row in rows
+            ]
+        )
+        feed = feed_cache.put(key, version, body, headers)
+    return _feed_response(request, feed)
 
 
 @app.post("/api/researches/{research_id}/replay", response_model=ResearchProposalResponse)
@@ -141,26 +245,37 @@ async def create_research_replay_session(research_id: uuid.UUID) -> ResearchProp
 
 
 @app.get("/api/topics/recommended")
-async def get_recommended_topics(locale: str = "en") -> list[dict]:
+async def get_recommended_topics(request: Request, locale: str = "en") -> Response:
     lang = locale if locale in RECOMMENDED_TOPICS else "en"
-    categories = copy.deepcopy(RECOMMENDED_TOPICS[lang])
-    candidate_topics = {
-        normalize_topic(topic["title"]) for category in categories for topic in category["topics"]
-    }
-    cached_set: set[str] = set()
-    if async_session_factory is not None:
+    key = ("recommended", lang)
+    feed = feed_cache.get(key)
+    if feed is None:
+        version = feed_cache.version
+        candidate_topics = {
+            normalize_topic(topic["title"])
+            for category in RECOMMENDED_TOPICS[lang]
+            for topic in category["topics"]
+        }
+        covered: set[str] = set()
         try:
-            async with async_session_factory() as db:
-                cached_set = set(
-                    await list_cached_topic_normalized(db, candidates=candidate_topics)
-                )
+            covered = await cached_topic_index.covered(candidate_topics)
         except Exception:
-            pass
-    for cat in categories:
-        for topic in cat["topics"]:
-            key = normalize_topic(topic["title"])
-            topic["cached"] = any(key in cached or cached in key for cached in cached_set)
-    return categories
+            logger.warning("Cached topic index load failed", exc_info=True)
+            version = -1  # serve the response without caching it
+        body = to_json(
+            [
+                {
+                    **category,
+                    "topics": [
+                        {**topic, "cached": normalize_topic(topic["title"]) in covered}
+                        for topic in category["topics"]
+                    ],
+                }
+                for category in RECOMMENDED_TOPICS[lang]
+            ]
+        )
+        feed = feed_cache.put(key, version, body)
+    return _feed_response(request, feed)
 
 
 @app.post(
@@ -226,20 +341,25 @@ async def create_research(request: ResearchRequest) -> ResearchProposalResponse:
             logger.warning("Similar topic check failed, falling back")
 
     # Layer 2: Redis proposal cache (generated but not yet researched)
-    cached_dict = await get_cached_proposal(normalized)
-    if cached_dict is not None:
-        try:
-            proposal = ResearchProposal.model_validate(cached_dict)
-            logger.info("Redis proposal cache hit for topic: %s", request.topic)
-            session_manager.create(session_id, proposal)
-            await store_session(session_id, proposal.model_dump(), "proposal_ready")
-            return ResearchProposalResponse(session_id=session_id, proposal=proposal)
-        except Exception:
-            logger.warning("Redis proposal validation failed, falling back to LLM")
+    proposal = await get_cached_proposal(normalized)
+    if proposal is not None:
+        logger.info("Redis proposal cache hit for topic: %s", request.topic)
+        session_manager.create(session_id, proposal)
+        await store_session(session_id, proposal.model_dump(), "proposal_ready")
+        return ResearchProposalResponse(session_id=session_id, proposal=proposal)
+
+    # Layer 3: Fresh LLM call, shared by concurrent requests for the same topic
+    # Set when this request's call is the one that runs (and stores the session).
+    leader = False
+
+    async def generate() -> ResearchProposal:
+        nonlocal leader
+        leader = True
+        return await _generate_proposal(request, normalized, flight_key, session_id)
 
-    # Layer 3: Fresh LLM call
     try:
-        proposal = await orchestrator.create_proposal(request)
+        flight_key = f"{request.language}:{normalized}"
+        proposal = await proposal_flights.do(flight_key, generate)
     except Exception as exc:
         logger.exception("Failed to create research proposal")
         raise HTTPException(
@@ -250,9 +370,9 @@ async def create_research(request: ResearchRequest) -> ResearchProposalResponse:
             ).model_dump(),
         ) from exc
 
-    await cache_proposal(normalized, proposal.model_dump())
     session_manager.create(session_id, proposal)
-    await store_session(session_id, proposal.model_dump(), "proposal_ready")
+    if not leader:
+        await store_session(session_id, proposal.model_dump(), "proposal_ready")
     return ResearchProposalResponse(session_id=session_id, proposal=proposal)
 
 
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+
+class EventLog[T]:
+    """Append-only event log shared by any number of subscribers.
+
+    Each subscriber keeps its own read offset, so nobody consumes events on behalf
+    of anyone else. Writers wake waiting readers through a condition instead of
+    readers polling the log.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[T] = []
+        self._closed = False
+        self._condition = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def entries(self) -> list[T]:
+        return self._entries
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def append(self, entry: T) -> None:
+        async with self._condition:
+            self._entries.append(entry)
+            self._condition.notify_all()
+
+    async def extend(self, entries: list[T]) -> None:
+        async with self._condition:
+            self._entries.extend(entries)
+            self._condition.notify_all()
+
+    async def close(self) -> None:
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    async def wait_beyond(self, offset: int) -> None:
+        """Block until the log holds more than ``offset`` entries or is closed."""
+        if offset < len(self._entries) or self._closed:
+            return
+        async with self._condition:
+            await self._condition.wait_for(lambda: offset < len(self._entries) or self._closed)
+
+    async def subscribe(self, offset: int = 0) -> AsyncIterator[list[T]]:
+        """Yield everything after ``offset`` as batches, until the log is closed and drained.
+
+        Each batch holds whatever was appended since the previous batch was taken,
+        so a reader that falls behind sees larger batches rather than more of them.
+        """
+        while True:
+            await self.wait_beyond(offset)
+            end = len(self._entries)
+            if end > offset:
+                yield self._entries[offset:end]
+            offset = end
+            if self._closed and offset >= len(self._entries):
+                return
@@ -171,8 +171,10 @@ class SynthesisResult(BaseModel):
 class SSEEventType(StrEnum):
     PROGRESS = "progress"
     SKELETON = "skeleton"
+    SKELETON_DELTA = "skeleton_delta"
     NODE_PROGRESS = "node_progress"
     NODE_DETAIL = "node_detail"
+    NODE_BATCH = "node_batch"
     SYNTHESIS = "synthesis"
     COMPLETE = "complete"
     RESEARCH_ERROR = "research_error"
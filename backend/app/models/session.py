@@ -1,14 +1,25 @@
+from __future__ import annotations
+
 import asyncio
-import json
+import logging
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import Callable
 from enum import StrEnum
-from typing import Any
+from typing import Any, Protocol
 
-from fastapi import Request
-from sse_starlette import ServerSentEvent
+from pydantic_core import to_json
 
+from app.models.event_log import EventLog
 from app.models.research import ResearchProposal, SSEEventType
 
+logger = logging.getLogger(__name__)
+
+# A subscriber more than this many events behind the log gets the compacted
+# remainder instead of every frame it missed (snapshot + resume).
+SUBSCRIBER_MAX_LAG = 256
+
 
 class SessionStatus(StrEnum):
     PROPOSAL_READY = "proposal_ready"
@@ -17,6 +28,152 @@ class SessionStatus(StrEnum):
     FAILED = "failed"
 
 
+class SessionEvent:
+    """An SSE event encoded once at push time and shared by every subscriber.
+
+    The frame's ``id`` is ``<epoch>.<seq>``: ``seq`` is the 1-based position in
+    the session log, ``epoch`` identifies which log produced it so a resume
+    request from another run of the session is not mistaken for an offset into
+    this one.
+    """
+
+    __slots__ = ("event_type", "seq", "key", "frame")
+
+    def __init__(
+        self,
+        event_type: SSEEventType,
+        frame: bytes,
+        *,
+        seq: int,
+        key: str | None = None,
+    ) -> None:
+        self.event_type = event_type
+        self.seq = seq
+        # Compaction key: progress phase, node id, "partial" for partial skeletons,
+        # or the node ids a node_batch carries (see ``_batch_key``).
+        self.key = key
+        self.frame = frame
+
+    @classmethod
+    def encode(
+        cls,
+        event_type: SSEEventType,
+        payload: dict[str, Any],
+        *,
+        seq: int,
+        epoch: str,
+    ) -> SessionEvent:
+        return cls.from_data(
+            event_type,
+            to_json(payload),
+            seq=seq,
+            epoch=epoch,
+            key=_compaction_key(event_type, payload),
+        )
+
+    @classmethod
+    def from_data(
+        cls,
+        event_type: SSEEventType,
+        data: bytes,
+        *,
+        seq: int,
+        epoch: str,
+        key: str | None = None,
+    ) -> SessionEvent:
+        """Frame an already JSON-encoded payload, e.g. one read from a replay artifact."""
+        frame = b"id: %s.%d\r\nevent: %s\r\ndata: %s\r\n\r\n" % (
+            epoch.encode(),
+            seq,
+            event_type.value.encode(),
+            data,
+        )
+        return cls(event_type, frame, seq=seq, key=key)
+
+    @property
+    def data(self) -> bytes:
+        start = self.frame.index(b"data: ") + len(b"data: ")
+        return self.frame[start:-4]
+
+
+class SessionEventSink(Protocol):
+    """Mirror of a session's events outside this process, e.g. a Redis stream."""
+
+    async def append(self, session_id: str, epoch: str, event: SessionEvent) -> None: ...
+
+    async def close(self, session_id: str, epoch: str, status: SessionStatus) -> None: ...
+
+
+def _compaction_key(event_type: SSEEventType, payload: dict[str, Any]) -> str | None:
+    if event_type == SSEEventType.PROGRESS:
+        return payload.get("phase")
+    if event_type in (SSEEventType.NODE_PROGRESS, SSEEventType.NODE_DETAIL):
+        return payload.get("node_id")
+    if event_type == SSEEventType.NODE_BATCH:
+        return _batch_key(payload)
+    if event_type == SSEEventType.SKELETON and payload.get("partial"):
+        return "partial"
+    return None
+
+
+def _batch_key(payload: dict[str, Any]) -> str:
+    """``"<progress node ids>/<detail node ids>"``, each list space-separated."""
+    progress = " ".join(item["node_id"] for item in payload.get("progress", []))
+    details = " ".join(item["node_id"] for item in payload.get("details", []))
+    return f"{progress}/{details}"
+
+
+def _batch_node_ids(key: str | None) -> tuple[list[str], list[str]]:
+    progress, _, details = (key or "").partition("/")
+    return progress.split(), details.split()
+
+
+_SKELETON_EVENTS = (SSEEventType.SKELETON, SSEEventType.SKELETON_DELTA)
+
+
+def compact_history(events: list[SessionEvent]) -> list[SessionEvent]:
+    """Reduce a session log to the smallest sequence that rebuilds the same client state.
+
+    - every skeleton event before the latest full skeleton is dropped, together
+      with the ``node_detail`` events it already carries;
+    - ``node_progress`` is dropped for nodes whose ``node_detail`` has arrived;
+    - a ``node_batch`` is dropped once all of its progress is for detailed nodes
+      and its details are either absent or carried by a later full skeleton;
+    - only the latest ``progress`` message of each phase is kept.
+
+    The result is a subsequence of the log, so event ids stay valid for resuming.
+    """
+    last_full = -1
+    detailed: set[str | None] = set()
+    latest_progress: dict[str | None, int] = {}
+    for index, event in enumerate(events):
+        if event.event_type == SSEEventType.SKELETON and event.key is None:
+            last_full = index
+        elif event.event_type == SSEEventType.NODE_DETAIL:
+            detailed.add(event.key)
+        elif event.event_type == SSEEventType.NODE_BATCH:
+            detailed.update(_batch_node_ids(event.key)[1])
+        elif event.event_type == SSEEventType.PROGRESS:
+            latest_progress[event.key] = index
+
+    kept_progress = set(latest_progress.values())
+    compacted: list[SessionEvent] = []
+    for index, event in enumerate(events):
+        event_type = event.event_type
+        if index < last_full and event_type in (*_SKELETON_EVENTS, SSEEventType.NODE_DETAIL):
+            continue
+        if event_type == SSEEventType.NODE_PROGRESS and event.key in detailed:
+            continue
+        if event_type == SSEEventType.NODE_BATCH:
+            progress, details = _batch_node_ids(event.key)
+            if detailed.issuperset(progress) and (index < last_full or not details):
+                continue
+        if event_type == SSEEventType.PROGRESS and index not in kept_progress:
+            continue
+        compacted.append(event)
+    return compacted
+
+
 class ResearchSession:
     def __init__(
         self,
@@ -25,75 +182,170 @@ class ResearchSession:
         *,
         status: SessionStatus = SessionStatus.PROPOSAL_READY,
         cached_research_id: uuid.UUID | None = None,
+        event_sink: SessionEventSink | None = None,
+        on_close: Callable[[ResearchSession], None] | None = None,
     ) -> None:
         self.session_id = session_id
         self.proposal = proposal
         self.status = status
-        self.queue: asyncio.Queue[tuple[SSEEventType, dict[str, Any]] | None] = asyncio.Queue()
         self.task: asyncio.Task[None] | None = None
         self.cached_research_id = cached_research_id
-        self._event_history: list[tuple[SSEEventType, dict[str, Any]]] = []
+        self.event_sink = event_sink
+        self.on_close = on_close
+        # Live runs get a fresh epoch; replays of a cached research replace it with
+        # one derived from the artifact they stream (``app.db.replay.prepare_replay``).
+        self.epoch = uuid.uuid4().hex[:12]
+        self._log: EventLog[SessionEvent] = EventLog()
+        self._compacted: tuple[int, list[SessionEvent]] = (0, [])
+        self.subscriber_count = 0
+        self._subscribed = asyncio.Event()
+        self._unsubscribed = asyncio.Event()
+        self._unsubscribed.set()
+        # Set once nobody has watched the run for the grace period and it is only
+        # being finished for the cache.
+        self.low_priority = False
+        # Last skeleton state the clients have seen, used to send skeleton deltas.
+        self.skeleton_snapshot: dict[str, dict[str, Any]] | None = None
+        self.skeleton_deltas_since_full = 0
+        self.history_bytes = 0
+        self.last_accessed = time.monotonic()
+
+    @property
+    def history(self) -> list[SessionEvent]:
+        return self._log.entries
 
     @property
     def has_events(self) -> bool:
-        return bool(self._event_history)
+        return bool(self._log)
+
+    @property
+    def is_running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def touch(self) -> None:
+        self.last_accessed = time.monotonic()
+
+    def _add_subscriber(self, delta: int) -> None:
+        self.subscriber_count += delta
+        if self.subscriber_count > 0:
+            self._subscribed.set()
+            self._unsubscribed.clear()
+        else:
+            self._subscribed.clear()
+            self._unsubscribed.set()
+
+    async def wait_subscribed(self) -> None:
+        """Return once at least one client is connected."""
+        await self._subscribed.wait()
+
+    async def wait_abandoned(self, grace_seconds: float) -> None:
+        """Return once no client has been connected for ``grace_seconds`` in a row."""
+        while True:
+            await self._unsubscribed.wait()
+            try:
+                await asyncio.wait_for(self._subscribed.wait(), grace_seconds)
+            except TimeoutError:
+                return
 
     async def push(self, event_type: SSEEventType, data: dict[str, Any]) -> None:
-        self._event_history.append((event_type, data))
-        if self.status not in (SessionStatus.COMPLETED, SessionStatus.FAILED):
-            await self.queue.put((event_type, data))
+        event = SessionEvent.encode(event_type, data, seq=len(self._log) + 1, epoch=self.epoch)
+        await self.append_event(event)
+        if self.event_sink is not None:
+            await self.event_sink.append(self.session_id, self.epoch, event)
+
+    async def append_event(self, event: SessionEvent) -> None:
+        """Append an already encoded event, e.g. one read back from another worker."""
+        self.history_bytes += len(event.frame)
+        await self._log.append(event)
+
+    async def append_events(self, events: list[SessionEvent]) -> None:
+        self.history_bytes += sum(len(event.frame) for event in events)
+        await self._log.extend(events)
 
     async def close(self) -> None:
-        await self.queue.put(None)
+        self.skeleton_snapshot = None
+        await self._log.close()
+        if self.event_sink is not None:
+            await self.event_sink.close(self.session_id, self.epoch, self.status)
+        if self.on_close is not None:
+            self.on_close(self)
 
-    async def event_generator(self, request: Request):
-        try:
-            while True:
-                if await request.is_disconnected():
-                    break
-                try:
-                    item = await asyncio.wait_for(self.queue.get(), timeout=5.0)
-                except TimeoutError:
-                    continue
-                if item is None:
-                    break
-                event_type, data = item
-                yield ServerSentEvent(
-                    data=json.dumps(data, ensure_ascii=False),
-                    event=event_type.value,
-                )
-        except asyncio.CancelledError:
-            raise
-
-    async def replay_and_stream(self, request: Request):
+    def resume_offset(self, last_event_id: str | None) -> int:
+        """Translate an SSE ``Last-Event-ID`` into a log offset; unknown ids restart at 0."""
+        if not last_event_id:
+            return 0
+        epoch, _, seq = last_event_id.strip().rpartition(".")
+        if epoch != self.epoch or not seq.isdigit():
+            return 0
+        return int(seq)
+
+    def compacted_history(self) -> tuple[int, list[SessionEvent]]:
+        """Compacted view of the log and the offset it covers up to.
+
+        The view is cached and shared by late joiners until the log grows.
+        """
+        end, compacted = self._compacted
+        if end != len(self._log):
+            end = len(self._log)
+            compacted = compact_history(self._log.entries[:end])
+            self._compacted = (end, compacted)
+        return end, compacted
+
+    async def event_generator(self, offset: int = 0):
+        """Stream history from ``offset``, then live events, until the session is closed.
+
+        A fresh subscriber (``offset == 0``) first receives the compacted history.
+        Every connected client gets its own cursor into the shared log, so a slow
+        reader holds no buffer of its own: it only pulls the next batch once the
+        previous one has been sent. When that batch is longer than
+        ``SUBSCRIBER_MAX_LAG`` it is compacted first, which conflates superseded
+        progress events. Client disconnects cancel this generator through
+        ``EventSourceResponse``.
+        """
+        self._add_subscriber(1)
         try:
-            idx = 0
-            while True:
-                if await request.is_disconnected():
-                    return
-
-                # Drain any new history entries
-                while idx < len(self._event_history):
-                    event_type, data = self._event_history[idx]
-                    idx += 1
-                    yield ServerSentEvent(
-                        data=json.dumps(data, ensure_ascii=False),
-                        event=event_type.value,
+            if offset == 0:
+                offset, compacted = self.compacted_history()
+                for event in compacted:
+                    yield event.frame
+            async for batch in self._log.subscribe(offset):
+                if len(batch) > SUBSCRIBER_MAX_LAG:
+                    logger.info(
+                        "Subscriber of session %s is %d events behind; sending compacted catch-up",
+                        self.session_id,
+                        len(batch),
                     )
+                    batch = compact_history(batch)
+                for event in batch:
+                    yield event.frame
+        finally:
+            self._add_subscriber(-1)
 
-                # If session is done, we've replayed everything
-                if self.status in (SessionStatus.COMPLETED, SessionStatus.FAILED):
-                    return
 
-                # Wait a bit for new events
-                await asyncio.sleep(0.3)
-        except asyncio.CancelledError:
-            raise
+class SessionManager:
+    """In-process session store with idle TTL, LRU eviction and a global byte budget.
 
+    Evicted sessions are not lost: the proposal and status stay in Redis, so
+    ``SessionLifecycleService.get_or_restore_session`` rebuilds them on demand.
+    Sessions with a running task are never evicted. The limits are enforced when
+    a session is created and again whenever one finishes, since a long run can
+    grow past the byte budget on its own.
+    """
 
-class SessionManager:
-    def __init__(self) -> None:
-        self._sessions: dict[str, ResearchSession] = {}
+    def __init__(
+        self,
+        *,
+        max_sessions: int = 200,
+        idle_ttl_seconds: float = 1800,
+        max_bytes: int = 64 * 1024 * 1024,
+        event_sink: SessionEventSink | None = None,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_bytes = max_bytes
+        self.event_sink = event_sink
+        self._sessions: OrderedDict[str, ResearchSession] = OrderedDict()
+        self._evictions = {"ttl": 0, "lru": 0, "bytes": 0}
 
     def create(
         self,
@@ -102,15 +354,88 @@ class SessionManager:
         *,
         status: SessionStatus = SessionStatus.PROPOSAL_READY,
         cached_research_id: uuid.UUID | None = None,
+        mirror_events: bool = True,
     ) -> ResearchSession:
+        # Replays of cached research are deterministic and can be rebuilt by any
+        # worker, so only live runs are mirrored to the shared event log.
+        mirror = mirror_events and cached_research_id is None
         session = ResearchSession(
             session_id,
             proposal,
             status=status,
             cached_research_id=cached_research_id,
+            event_sink=self.event_sink if mirror else None,
+            on_close=self._session_closed,
         )
         self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        self.sweep(keep=session_id)
         return session
 
+    def _session_closed(self, session: ResearchSession) -> None:
+        # Its log has stopped growing; re-check the budget once the run has ended
+        # (close() usually runs inside the task, which is not evictable yet).
+        if session.is_running:
+            session.task.add_done_callback(lambda _task: self.sweep())
+        else:
+            self.sweep()
+
     def get(self, session_id: str) -> ResearchSession | None:
-        return self._sessions.get(session_id)
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if self._is_expired(session, time.monotonic()):
+            self._evict(session_id, "ttl")
+            return None
+        session.touch()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session so the next lookup rebuilds it from Redis."""
+        self._sessions.pop(session_id, None)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(session.history_bytes for session in self._sessions.values())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "running": sum(1 for session in self._sessions.values() if session.is_running),
+            "bytes": self.total_bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "evictions": dict(self._evictions),
+        }
+
+    def sweep(self, *, keep: str | None = None) -> None:
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if self._is_expired(session, now):
+                self._evict(session_id, "ttl")
+
+        total_bytes = self.total_bytes
+        for session_id, session in list(self._sessions.items()):
+            over_count = len(self._sessions) > self.max_sessions
+            over_bytes = total_bytes > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            if session.is_running or session_id == keep:
+                continue
+            total_bytes -= session.history_bytes
+            self._evict(session_id, "lru" if over_count else "bytes")
+
+    def _is_expired(self, session: ResearchSession, now: float) -> bool:
+        return not session.is_running and now - session.last_accessed > self.idle_ttl_seconds
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._evictions[reason] += 1
+        logger.info(
+            "Evicted session %s (%s, %d bytes, %d remaining)",
+            session_id,
+            reason,
+            session.history_bytes,
+            len(self._sessions),
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from app.config import settings
@@ -96,7 +97,7 @@ class Orchestrator:
             if async_session_factory is not None:
                 try:
                     async with async_session_factory() as db:
-                        await save_research(
+                        session.cached_research_id = await save_research(
                             db,
                             proposal=state.proposal,
                             nodes=runtime_nodes_to_dicts(state.nodes),
@@ -113,6 +114,16 @@ class Orchestrator:
                 SessionStatus.COMPLETED.value,
                 cached_research_id=session.cached_research_id,
             )
+        except asyncio.CancelledError:
+            # Abandoned by every client: nothing is cached, so the session goes
+            # back to its proposal and a returning client can start it again.
+            session.status = SessionStatus.PROPOSAL_READY
+            await update_session_status(
+                session.session_id,
+                SessionStatus.PROPOSAL_READY.value,
+                cached_research_id=session.cached_research_id,
+            )
+            raise
         except Exception:
             logger.exception("Research execution failed")
             await push_research_error(
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import itertools
 import logging
 
@@ -15,9 +16,8 @@ from app.orchestrator.verification import RECENT_CUTOFF
 from app.services.llm import resolve_model
 from app.services.tavily import TavilyService
 from app.sse.event_publisher import (
+    NodeEventBatcher,
     friendly_model_name,
-    push_node_detail,
-    push_node_progress,
     push_progress,
 )
 
@@ -42,6 +42,19 @@ def build_detail_pool() -> list[Model]:
 
 DETAIL_POOL = build_detail_pool()
 
+# Detail slots shared by every run that is being finished for the cache after its
+# clients left, so those runs cannot crowd out sessions someone is watching.
+BACKGROUND_DETAIL_SLOTS = asyncio.Semaphore(settings.background_detail_concurrency)
+
+
+@contextlib.asynccontextmanager
+async def _background_slot(session: ResearchSession):
+    if not session.low_priority:
+        yield
+        return
+    async with BACKGROUND_DETAIL_SLOTS:
+        yield
+
 
 async def run_detail_phase(
     state: RuntimeResearchState,
@@ -70,7 +83,7 @@ async def enrich_nodes(
     node_index = {node.id: idx for idx, node in enumerate(state.nodes)}
 
     async def enrich_node(node: RuntimeTimelineNode) -> None:
-        async with sem:
+        async with sem, _background_slot(session):
             model_override = None
             model_name_str = settings.detail_model
             if DETAIL_POOL:
@@ -81,8 +94,7 @@ async def enrich_nodes(
                     model_name_str = pool_parts[idx].strip()
 
             friendly = friendly_model_name(model_name_str)
-            await push_node_progress(
-                session,
+            await events.node_progress(
                 node_id=node.id,
                 model=friendly,
                 step="searching",
@@ -105,8 +117,11 @@ async def enrich_nodes(
         if updated.date >= RECENT_CUTOFF:
             state.detail_contexts[updated.id] = search_context
         state.nodes[node_index[updated.id]] = updated
-        await push_node_detail(session, updated)
+        await events.node_detail(updated)
 
-    async with asyncio.TaskGroup() as tg:
+    async with (
+        NodeEventBatcher(session, window_ms=settings.detail_event_window_ms) as events,
+        asyncio.TaskGroup() as tg,
+    ):
         for node in nodes:
             tg.create_task(enrich_node(node))
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from pydantic_ai.models import Model
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from pydantic_ai.messages import ModelResponse
+from pydantic_ai.models import Model, StreamedResponse
 from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.models.wrapper import WrapperModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
 from app.config import settings
+from app.services.rate_limit import acquire, llm_bucket
 
 _provider: OpenAIProvider | None = None
 
@@ -22,6 +29,24 @@ def _get_provider() -> OpenAIProvider:
     return _provider
 
 
+class RateLimitedModel(WrapperModel):
+    """Takes a token from the model's shared quota before every request, retries included."""
+
+    def __init__(self, wrapped: Model, bucket: str) -> None:
+        super().__init__(wrapped)
+        self.bucket = bucket
+
+    async def request(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        await acquire(self.bucket)
+        return await super().request(*args, **kwargs)
+
+    @asynccontextmanager
+    async def request_stream(self, *args: Any, **kwargs: Any) -> AsyncIterator[StreamedResponse]:
+        await acquire(self.bucket)
+        async with super().request_stream(*args, **kwargs) as response_stream:
+            yield response_stream
+
+
 def resolve_model(model_string: str) -> Model:
     """
     解析模型字符串，返回 Pydantic AI Model 实例。
@@ -36,4 +61,4 @@ def resolve_model(model_string: str) -> Model:
         )
 
     provider = _get_provider()
-    return OpenAIModel(model_string, provider=provider)
+    return RateLimitedModel(OpenAIModel(model_string, provider=provider), llm_bucket(model_string))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Protocol
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Waits longer than this are logged; all waits are counted in rate_limit_stats().
+SLOW_WAIT_SECONDS = 5.0
+
+
+class RateLimiter(Protocol):
+    """Shared quota backend; ``acquire`` returns once a call may be made."""
+
+    async def acquire(self, bucket: str, per_minute: int) -> None: ...
+
+
+_limiter: RateLimiter | None = None
+_wait_stats: dict[str, dict[str, float]] = {}
+
+
+def set_rate_limiter(limiter: RateLimiter | None) -> None:
+    global _limiter
+    _limiter = limiter
+
+
+def llm_bucket(model_string: str) -> str:
+    return f"llm:{model_string}"
+
+
+def search_bucket(provider: str) -> str:
+    return f"search:{provider}"
+
+
+def _llm_overrides() -> dict[str, int]:
+    overrides: dict[str, int] = {}
+    for part in settings.llm_rate_limits.split(","):
+        model_string, _, per_minute = part.strip().rpartition("=")
+        if not model_string:
+            continue
+        try:
+            overrides[model_string] = int(per_minute)
+        except ValueError:
+            logger.warning("Skipping invalid LLM rate limit: %s", part)
+    return overrides
+
+
+def requests_per_minute(bucket: str) -> int:
+    """Quota for a bucket; 0 means unlimited."""
+    kind, _, name = bucket.partition(":")
+    if kind == "llm":
+        return _llm_overrides().get(name, settings.llm_requests_per_minute)
+    if kind == "search" and name == "tavily":
+        return settings.tavily_requests_per_minute
+    return 0
+
+
+async def acquire(bucket: str) -> None:
+    per_minute = requests_per_minute(bucket)
+    if _limiter is None or per_minute <= 0:
+        return
+    started = time.monotonic()
+    await _limiter.acquire(bucket, per_minute)
+    waited = time.monotonic() - started
+
+    stats = _wait_stats.setdefault(bucket, {"calls": 0, "wait_seconds": 0.0, "max_wait": 0.0})
+    stats["calls"] += 1
+    stats["wait_seconds"] += waited
+    stats["max_wait"] = max(stats["max_wait"], waited)
+    if waited > SLOW_WAIT_SECONDS:
+        logger.info("Waited %.1fs for rate limit bucket %s", waited, bucket)
+
+
+def rate_limit_stats() -> dict[str, Any]:
+    return {
+        bucket: {
+            "per_minute": requests_per_minute(bucket),
+            "calls": int(stats["calls"]),
+            "avg_wait_ms": round(stats["wait_seconds"] / stats["calls"] * 1000, 1),
+            "max_wait_ms": round(stats["max_wait"] * 1000, 1),
+        }
+        for bucket, stats in _wait_stats.items()
+    }
@@ -1,6 +1,7 @@
 from tavily import AsyncTavilyClient
 
 from app.config import settings
+from app.services.rate_limit import acquire, search_bucket
 
 
 class TavilyService:
@@ -16,6 +17,7 @@ class TavilyService:
         topic: str = "general",
         include_answer: bool = True,
     ) -> dict:
+        await acquire(search_bucket("tavily"))
         return await self._client.search(
             query=query,
             max_results=max_results,
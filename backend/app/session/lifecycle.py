@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 import uuid
 from collections.abc import Awaitable, Callable
@@ -8,19 +9,37 @@ from collections.abc import Awaitable, Callable
 from fastapi import HTTPException, Request
 from sse_starlette import EventSourceResponse
 
+from app.config import settings
 from app.db.database import async_session_factory
-from app.db.redis import get_session_data, update_session_status
-from app.db.replay import replay_research
+from app.db.redis import (
+    SESSION_WATCHER_TTL,
+    count_session_watchers,
+    get_session_data,
+    get_session_events_tail,
+    read_session_events,
+    reset_session_events,
+    touch_session_watcher,
+    update_session_status,
+)
+from app.db.replay import prepare_replay, replay_research
 from app.db.repository import get_research_id_by_topic
 from app.models.research import ResearchProposal
 from app.models.session import ResearchSession, SessionManager, SessionStatus
+from app.sse.compression import CompressedEventSourceResponse, negotiate_encoding
 
 logger = logging.getLogger(__name__)
 
+# 另一个 worker 正在执行的会话：从 Redis Stream 跟随事件，超过该时长无新事件视为已中断
+REMOTE_STREAM_STALL_SECONDS = 300
+REMOTE_STREAM_BLOCK_MS = 15000
+# 降为低优先级的会话多久检查一次其他 worker 上是否又有人在看
+WATCHER_RECHECK_SECONDS = SESSION_WATCHER_TTL / 3
+
 
 class SessionLifecycleService:
     def __init__(self, session_manager: SessionManager) -> None:
         self.session_manager = session_manager
+        self._watchdogs: set[asyncio.Task[None]] = set()
 
     async def get_or_restore_session(self, session_id: str) -> ResearchSession | None:
         session = self.session_manager.get(session_id)
@@ -32,11 +51,15 @@ class SessionLifecycleService:
             return None
 
         try:
-            proposal = ResearchProposal.model_validate(redis_data["proposal"])
+            proposal: ResearchProposal = redis_data["proposal"]
             status = SessionStatus(redis_data.get("status", SessionStatus.PROPOSAL_READY))
             cached_research_id = self._parse_cached_research_id(
                 redis_data.get("cached_research_id")
             )
+            if status == SessionStatus.EXECUTING and cached_research_id is None:
+                follower = await self._follow_remote_session(session_id, proposal)
+                if follower is not None:
+                    return follower
             cached_research_id, status = await self._reconcile_cached_research(
                 proposal.topic,
                 cached_research_id,
@@ -58,6 +81,72 @@ class SessionLifecycleService:
             logger.warning("Failed to reconstruct session from Redis", exc_info=True)
             return None
 
+    async def _follow_remote_session(
+        self,
+        session_id: str,
+        proposal: ResearchProposal,
+    ) -> ResearchSession | None:
+        tail = await get_session_events_tail(session_id)
+        if tail is None:
+            return None
+        epoch, age_seconds, ended = tail
+        if ended or age_seconds > REMOTE_STREAM_STALL_SECONDS:
+            return None
+
+        session = self.session_manager.create(
+            session_id,
+            proposal,
+            status=SessionStatus.EXECUTING,
+            mirror_events=False,
+        )
+        session.epoch = epoch
+        session.task = asyncio.create_task(self._follow_remote_events(session))
+        logger.info("Following session %s from its Redis event stream", session_id)
+        return session
+
+    async def _follow_remote_events(self, session: ResearchSession) -> None:
+        loop = asyncio.get_running_loop()
+        last_id = "0-0"
+        idle_since = loop.time()
+        touched_at: float | None = None
+        try:
+            while True:
+                # Tell the owning worker's abandonment watchdog someone is watching.
+                if session.subscriber_count and (
+                    touched_at is None or loop.time() - touched_at > SESSION_WATCHER_TTL / 3
+                ):
+                    await touch_session_watcher(session.session_id)
+                    touched_at = loop.time()
+                result = await read_session_events(
+                    session.session_id,
+                    last_id,
+                    epoch=session.epoch,
+                    block_ms=REMOTE_STREAM_BLOCK_MS,
+                )
+                if result is None:
+                    session.status = SessionStatus.FAILED
+                    return
+                last_id, events, final_status = result
+                for event in events:
+                    await session.append_event(event)
+                if final_status is not None:
+                    session.status = final_status
+                    if final_status == SessionStatus.PROPOSAL_READY:
+                        # The run was cancelled; a reconnect rebuilds the session
+                        # from Redis and starts it again.
+                        self.session_manager.discard(session.session_id)
+                    return
+
+                now = loop.time()
+                if events:
+                    idle_since = now
+                elif now - idle_since > REMOTE_STREAM_STALL_SECONDS:
+                    logger.warning("Remote session %s stalled; stop following", session.session_id)
+                    session.status = SessionStatus.FAILED
+                    return
+        finally:
+            await session.close()
+
     async def get_status_payload(self, session_id: str) -> dict | None:
         session = await self.get_or_restore_session(session_id)
         if session is None:
@@ -79,24 +168,28 @@ class SessionLifecycleService:
 
         if session.status == SessionStatus.PROPOSAL_READY:
             await self._start_session(session, execute_research)
-            generator = session.event_generator(request)
         elif (
             session.task is None
             and session.cached_research_id is not None
             and not session.has_events
         ):
             session.status = SessionStatus.EXECUTING
-            session.task = asyncio.create_task(replay_research(session, session.cached_research_id))
-            generator = session.event_generator(request)
-        else:
-            generator = session.replay_and_stream(request)
-
-        return EventSourceResponse(
-            generator,
-            ping=15,
-            send_timeout=30,
-            headers={"X-Accel-Buffering": "no"},
+            await self._start_replay(session)
+
+        offset = session.resume_offset(self._last_event_id(request))
+        options = {"ping": 15, "send_timeout": 30, "headers": {"X-Accel-Buffering": "no"}}
+        encoding = (
+            negotiate_encoding(request.headers.get("accept-encoding"))
+            if settings.sse_compression_enabled
+            else None
         )
+        if encoding is not None:
+            return CompressedEventSourceResponse(
+                session.event_generator(offset),
+                encoding=encoding,
+                **options,
+            )
+        return EventSourceResponse(session.event_generator(offset), **options)
 
     async def _start_session(
         self,
@@ -114,10 +207,87 @@ class SessionLifecycleService:
         )
 
         if session.cached_research_id is not None:
-            session.task = asyncio.create_task(replay_research(session, session.cached_research_id))
+            await self._start_replay(session)
             return
 
+        # A cancelled earlier run may have left its frames in the shared stream.
+        await reset_session_events(session.session_id)
         session.task = asyncio.create_task(execute_research(session))
+        watchdog = asyncio.create_task(self._watch_abandonment(session))
+        self._watchdogs.add(watchdog)
+        watchdog.add_done_callback(self._watchdogs.discard)
+
+    @staticmethod
+    async def _start_replay(session: ResearchSession) -> None:
+        assert session.cached_research_id is not None
+        artifact = await prepare_replay(session, session.cached_research_id)
+        if session.task is not None:  # a concurrent connect started it meanwhile
+            return
+        session.task = asyncio.create_task(
+            replay_research(session, session.cached_research_id, artifact)
+        )
+
+    async def _watch_abandonment(self, session: ResearchSession) -> None:
+        """Cancel or deprioritise a live run once nobody has watched it for the grace period.
+
+        Clients following the run through another worker count as watchers: their
+        worker keeps a heartbeat in Redis (``touch_session_watcher``). Under the
+        "finish" policy a deprioritised run gets its priority back as soon as
+        someone watches again, and loses it again the next time it is abandoned.
+        """
+        assert session.task is not None
+        run = session.task
+        while await self._wait_abandoned(session, run):
+            if settings.abandoned_session_policy != "finish":
+                logger.info("Session %s abandoned; cancelling research", session.session_id)
+                run.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await run
+                # The run reset the stored status, so a returning client starts over.
+                self.session_manager.discard(session.session_id)
+                return
+
+            logger.info("Session %s abandoned; finishing in background", session.session_id)
+            session.low_priority = True
+            if not await self._wait_watched(session, run):
+                return
+            logger.info("Session %s watched again; restoring priority", session.session_id)
+            session.low_priority = False
+
+    @staticmethod
+    async def _wait_abandoned(session: ResearchSession, run: asyncio.Task[None]) -> bool:
+        """True once no worker has had a client for the grace period, False if the run ended."""
+        while True:
+            abandoned = asyncio.create_task(
+                session.wait_abandoned(settings.abandoned_session_grace_seconds)
+            )
+            try:
+                await asyncio.wait({run, abandoned}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                abandoned.cancel()
+            if run.done():
+                return False
+            if not await count_session_watchers(session.session_id):
+                return True
+
+    @staticmethod
+    async def _wait_watched(session: ResearchSession, run: asyncio.Task[None]) -> bool:
+        """True once a client on any worker watches the run again, False if it ended."""
+        while not run.done():
+            subscribed = asyncio.create_task(session.wait_subscribed())
+            try:
+                await asyncio.wait(
+                    {run, subscribed},
+                    timeout=WATCHER_RECHECK_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                subscribed.cancel()
+            if run.done():
+                return False
+            if session.subscriber_count or await count_session_watchers(session.session_id):
+                return True
+        return False
 
     async def _reconcile_cached_research(
         self,
@@ -137,6 +307,12 @@ class SessionLifecycleService:
             return None, SessionStatus.PROPOSAL_READY
         return research_id, status
 
+    @staticmethod
+    def _last_event_id(request: Request) -> str | None:
+        # EventSource sends the header on its own reconnects; clients that reopen
+        # the stream manually pass the id as a query parameter instead.
+        return request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+
     @staticmethod
     def _parse_cached_research_id(raw: str | None) -> uuid.UUID | None:
         if not raw:
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import zlib
+
+from sse_starlette import EventSourceResponse
+from starlette.types import Message, Receive, Scope, Send
+
+SSE_COMPRESSION_LEVEL = 6
+
+# zlib wbits per Content-Encoding; gzip first because every browser supports it.
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick a supported Content-Encoding from an ``Accept-Encoding`` header."""
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    best: tuple[float, str] | None = None
+    for coding in _WBITS:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[0]):
+            best = (quality, coding)
+    return best[1] if best else None
+
+
+class StreamCompressor:
+    """One compression stream per connection, sync-flushed after every chunk.
+
+    A sync flush ends each chunk on a byte boundary, so the client can inflate an
+    event as soon as it arrives while later events still reuse the shared window
+    (repeated keys and node ids compress to back-references).
+    """
+
+    def __init__(self, encoding: str, level: int = SSE_COMPRESSION_LEVEL) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, chunk: bytes = b"") -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressedEventSourceResponse(EventSourceResponse):
+    """``EventSourceResponse`` that compresses every body message, pings included."""
+
+    def __init__(self, *args, encoding: str, **kwargs) -> None:
+        headers = {
+            **(kwargs.pop("headers", None) or {}),
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+        }
+        super().__init__(*args, headers=headers, **kwargs)
+        self.encoding = encoding
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await super().__call__(scope, receive, compressing_send(send, self.encoding))
+
+
+def compressing_send(send: Send, encoding: str) -> Send:
+    compressor = StreamCompressor(encoding)
+    lock = asyncio.Lock()
+
+    async def wrapped(message: Message) -> None:
+        if message["type"] != "http.response.body":
+            await send(message)
+            return
+        # Events and pings are sent from different tasks; compress and send
+        # under one lock so chunks reach the socket in compression order.
+        async with lock:
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            body = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({**message, "body": body})
+
+    return wrapped
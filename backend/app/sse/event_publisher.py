@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any
+
 from app.models.research import SSEEventType
 from app.models.runtime import RuntimeResearchState, RuntimeTimelineNode
 from app.models.session import ResearchSession
 
+# New subscribers need a full skeleton somewhere in the recent history, so deltas
+# are periodically replaced by a full snapshot.
+SKELETON_FULL_SNAPSHOT_EVERY = 5
+
+# Upper bound on node events merged into one node_batch frame.
+NODE_BATCH_MAX_EVENTS = 64
+
 
 def friendly_model_name(model_string: str) -> str:
     if ":" in model_string:
@@ -44,10 +54,62 @@ async def push_skeleton(
     *,
     partial: bool = False,
 ) -> None:
-    payload = {"nodes": [node.to_sse_dict() for node in nodes]}
+    node_dicts = [node.to_sse_dict() for node in nodes]
     if partial:
-        payload["partial"] = True
-    await session.push(SSEEventType.SKELETON, payload)
+        await session.push(SSEEventType.SKELETON, {"nodes": node_dicts, "partial": True})
+        return
+
+    snapshot = {node["id"]: node for node in node_dicts}
+    previous = session.skeleton_snapshot
+    session.skeleton_snapshot = snapshot
+    if previous is not None and session.skeleton_deltas_since_full < SKELETON_FULL_SNAPSHOT_EVERY:
+        delta = _skeleton_delta(previous, snapshot)
+        if not delta:
+            return
+        touched = len(delta.get("added", ())) + len(delta.get("changed", ()))
+        if touched <= len(snapshot) // 2:
+            session.skeleton_deltas_since_full += 1
+            await session.push(SSEEventType.SKELETON_DELTA, delta)
+            return
+
+    session.skeleton_deltas_since_full = 0
+    await session.push(SSEEventType.SKELETON, {"nodes": node_dicts})
+
+
+def _skeleton_delta(
+    previous: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    """Diff two skeleton snapshots keyed by node id.
+
+    ``changed`` entries carry only the fields whose values differ; fields missing
+    from the new node are left untouched, matching how a full skeleton merges.
+    ``order`` is sent only when the final order differs from "survivors in their
+    previous order, then added nodes".
+    """
+    added = [node for node_id, node in current.items() if node_id not in previous]
+    removed = [node_id for node_id in previous if node_id not in current]
+    changed = []
+    for node_id, node in current.items():
+        old = previous.get(node_id)
+        if old is None:
+            continue
+        fields = {key: value for key, value in node.items() if old.get(key) != value}
+        if fields:
+            changed.append({"id": node_id, **fields})
+
+    delta: dict[str, Any] = {}
+    if added:
+        delta["added"] = added
+    if removed:
+        delta["removed"] = removed
+    if changed:
+        delta["changed"] = changed
+    expected_order = [node_id for node_id in previous if node_id in current]
+    expected_order.extend(node["id"] for node in added)
+    if list(current) != expected_order:
+        delta["order"] = list(current)
+    return delta
 
 
 async def push_node_progress(
@@ -57,26 +119,121 @@ async def push_node_progress(
     model: str,
     step: str,
 ) -> None:
-    await session.push(
-        SSEEventType.NODE_PROGRESS,
-        {
-            "node_id": node_id,
-            "model": model,
-            "step": step,
-        },
-    )
+    await session.push(SSEEventType.NODE_PROGRESS, _node_progress_payload(node_id, model, step))
 
 
 async def push_node_detail(session: ResearchSession, node: RuntimeTimelineNode) -> None:
+    payload = _node_detail_payload(session, node)
+    if payload is not None:
+        await session.push(SSEEventType.NODE_DETAIL, payload)
+
+
+def _node_progress_payload(node_id: str, model: str, step: str) -> dict[str, Any]:
+    return {
+        "node_id": node_id,
+        "model": model,
+        "step": step,
+    }
+
+
+def _node_detail_payload(
+    session: ResearchSession,
+    node: RuntimeTimelineNode,
+) -> dict[str, Any] | None:
     if node.details is None:
-        return
-    await session.push(
-        SSEEventType.NODE_DETAIL,
-        {
-            "node_id": node.id,
-            "details": node.details.model_dump(),
-        },
-    )
+        return None
+    details = node.details.model_dump()
+    snapshot = session.skeleton_snapshot
+    if snapshot is not None and node.id in snapshot:
+        snapshot[node.id] = {**snapshot[node.id], "details": details, "status": "complete"}
+    return {
+        "node_id": node.id,
+        "details": details,
+    }
+
+
+class NodeEventBatcher:
+    """Coalesces node_progress / node_detail events that arrive within a short window.
+
+    The first event of a window starts a timer; everything that arrives before it
+    fires goes out as one ``node_batch`` frame. Within a window only the latest
+    progress per node is kept, and progress for a node whose detail is in the same
+    window is dropped. A window holding a single event is sent as that plain event.
+
+    Use it as an async context manager around the code that produces node events,
+    so pending events are flushed before anything else is pushed to the session.
+    ``window_ms=0`` sends every event immediately.
+    """
+
+    def __init__(self, session: ResearchSession, *, window_ms: int) -> None:
+        self.session = session
+        self.window = window_ms / 1000
+        self._progress: dict[str, dict[str, Any]] = {}
+        self._details: dict[str, dict[str, Any]] = {}
+        self._timer: asyncio.Task[None] | None = None
+        # Serialises flushes so frames keep their order in the log and the sink.
+        self._flush_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> NodeEventBatcher:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+    async def node_progress(self, *, node_id: str, model: str, step: str) -> None:
+        if self.window <= 0:
+            await push_node_progress(self.session, node_id=node_id, model=model, step=step)
+            return
+        self._progress[node_id] = _node_progress_payload(node_id, model, step)
+        await self._schedule()
+
+    async def node_detail(self, node: RuntimeTimelineNode) -> None:
+        if self.window <= 0:
+            await push_node_detail(self.session, node)
+            return
+        payload = _node_detail_payload(self.session, node)
+        if payload is None:
+            return
+        self._details[node.id] = payload
+        await self._schedule()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            progress = [
+                payload
+                for node_id, payload in self._progress.items()
+                if node_id not in self._details
+            ]
+            details = list(self._details.values())
+            self._progress = {}
+            self._details = {}
+
+            if len(progress) + len(details) > 1:
+                await self.session.push(
+                    SSEEventType.NODE_BATCH,
+                    {"progress": progress, "details": details},
+                )
+            elif progress:
+                await self.session.push(SSEEventType.NODE_PROGRESS, progress[0])
+            elif details:
+                await self.session.push(SSEEventType.NODE_DETAIL, details[0])
+
+    async def _schedule(self) -> None:
+        if len(self._progress) + len(self._details) >= NODE_BATCH_MAX_EVENTS:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self.flush()
 
 
 async def push_synthesis(session: ResearchSession, synthesis_data: dict) -> None:
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+
+class SingleFlight[T]:
+    """Coalesces concurrent calls with the same key into one in-flight call.
+
+    The call runs in its own task, so a caller that goes away (client
+    disconnect) does not cancel it for the callers still waiting.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Task[T]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: str, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Every waiter may have gone away; mark the exception as retrieved.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+
+
+class AhoCorasick:
+    """Finds every pattern occurring in a text in one pass over the text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[set[str]] = [set()]
+        for pattern in patterns:
+            if pattern:
+                self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            state = next_state
+        self._output[state].add(pattern)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> set[str]:
+        found: set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found |= self._output[state]
+        return found
+
+
+class CachedTopicMatcher:
+    """Tracks which candidate topics are covered by a cached research.
+
+    A candidate is covered when it occurs in a cached topic or a cached topic
+    occurs in it. The first direction scans the cached topic with an automaton
+    over the candidates; the second is a lookup in the candidates' substrings.
+    Both cost O(len(topic)) per cached topic, and queries are a set intersection.
+    """
+
+    def __init__(self, candidates: Iterable[str]) -> None:
+        self.candidates = frozenset(candidate for candidate in candidates if candidate)
+        self._automaton = AhoCorasick(self.candidates)
+        self._containing: dict[str, set[str]] = {}
+        for candidate in self.candidates:
+            for start in range(len(candidate)):
+                for end in range(start + 1, len(candidate) + 1):
+                    self._containing.setdefault(candidate[start:end], set()).add(candidate)
+        self._covered: set[str] = set()
+
+    def add(self, topic: str) -> None:
+        if not topic:
+            return
+        self._covered |= self._automaton.find(topic)
+        self._covered |= self._containing.get(topic, set())
+
+    def reset(self, topics: Iterable[str]) -> None:
+        self._covered = set()
+        for topic in topics:
+            self.add(topic)
+
+    def covered(self, candidates: Iterable[str]) -> set[str]:
+        return self._covered.intersection(candidates)
@@ -0,0 +1,70 @@
+"""
+回放产物回填
+
+为缺少当前版本回放产物（research_replays）的研究生成预编码的事件序列。
+升级 REPLAY_ARTIFACT_VERSION 后重新运行即可整体重建。
+
+用法：
+  python scripts/backfill_replay_artifacts.py              # 回填全部
+  python scripts/backfill_replay_artifacts.py --batch 50   # 每批处理条数
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.db.database import async_session_factory, engine  # noqa: E402
+from app.db.replay import REPLAY_ARTIFACT_VERSION, build_replay_artifact  # noqa: E402
+from app.db.repository import (  # noqa: E402
+    get_nodes_for_research_replay,
+    list_researches_without_replay_artifact,
+    save_replay_artifact,
+)
+from app.models.research import ResearchProposal  # noqa: E402
+
+
+async def backfill(batch_size: int) -> int:
+    if async_session_factory is None:
+        print("❌ DATABASE_URL 未配置")
+        return 0
+
+    total = 0
+    while True:
+        async with async_session_factory() as db:
+            rows = await list_researches_without_replay_artifact(
+                db, version=REPLAY_ARTIFACT_VERSION, limit=batch_size
+            )
+            if not rows:
+                return total
+            for row in rows:
+                artifact = await build_replay_artifact(
+                    ResearchProposal.model_validate(row.proposal),
+                    synthesis=row.synthesis,
+                    total_nodes=row.total_nodes,
+                    node_rows=await get_nodes_for_research_replay(db, row.id),
+                )
+                await save_replay_artifact(
+                    db, row.id, version=REPLAY_ARTIFACT_VERSION, payload=artifact
+                )
+            await db.commit()
+        total += len(rows)
+        print(f"  已回填 {total} 条")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    total = await backfill(args.batch)
+    print(f"✅ 回放产物回填完成（v{REPLAY_ARTIFACT_VERSION}，共 {total} 条）")
+    if engine is not None:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,242 @@
+"""
+save_research 写入延迟基准（批量 upsert + 只写变化节点 vs 旧的逐行 INSERT + 全量删除重写）
+
+在 DATABASE_URL 指向的库中创建临时 schema，按 20 / 80 / 150 个节点分别测量：
+  - 首次保存（新研究）
+  - 原样重新保存（重跑结果未变）
+  - 10% 节点变化后重新保存
+结束后删除临时 schema，不触碰真实数据（asyncpg 驱动）。
+
+用法：
+  python scripts/bench_save_research.py                  # 每组 10 次取中位数
+  python scripts/bench_save_research.py --repeat 30
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import delete, pool, text, update  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db.models import Base, ResearchRow, TimelineNodeRow  # noqa: E402
+from app.db.replay import REPLAY_ARTIFACT_VERSION, build_replay_artifact  # noqa: E402
+from app.db.repository import (  # noqa: E402
+    get_research_id_by_topic,
+    save_replay_artifact,
+    save_research,
+)
+from app.models.research import ResearchProposal  # noqa: E402
+from app.utils.topic import normalize_topic  # noqa: E402
+
+SCHEMA = "bench_save_research"
+NODE_COUNTS = (20, 80, 150)
+
+
+async def legacy_save_research(
+    session: AsyncSession,
+    *,
+    proposal: ResearchProposal,
+    nodes: list[dict],
+    synthesis_data: dict | None,
+    total_nodes: int,
+    source_count: int,
+):
+    """save_research as it was before batched upserts."""
+    existing_id = await get_research_id_by_topic(session, proposal.topic)
+    values = {
+        "topic_normalized": normalize_topic(proposal.topic),
+        "topic_type": proposal.topic_type.value,
+        "language": proposal.language,
+        "complexity_level": proposal.complexity.level.value,
+        "proposal": proposal.model_dump(),
+        "synthesis": synthesis_data,
+        "total_nodes": total_nodes,
+        "source_count": source_count,
+    }
+    if existing_id:
+        await session.execute(
+            update(ResearchRow)
+            .where(ResearchRow.id == existing_id)
+            .values(updated_at=datetime.now(), **values)
+        )
+        await session.execute(
+            delete(TimelineNodeRow).where(TimelineNodeRow.research_id == existing_id)
+        )
+        await session.flush()
+        research_id = existing_id
+    else:
+        research = ResearchRow(topic=proposal.topic, **values)
+        session.add(research)
+        await session.flush()
+        research_id = research.id
+
+    node_rows = [
+        TimelineNodeRow(
+            research_id=research_id,
+            node_id=node["id"],
+            date=node["date"],
+            title=node["title"],
+            subtitle=node.get("subtitle", ""),
+            significance=node["significance"],
+            description=node["description"],
+            details=node.get("details"),
+            is_gap_node=node.get("is_gap_node", False),
+            phase_name=node.get("phase_name"),
+            sort_order=i,
+        )
+        for i, node in enumerate(nodes)
+    ]
+    for row in node_rows:
+        session.add(row)
+    artifact = await build_replay_artifact(
+        proposal, synthesis=synthesis_data, total_nodes=total_nodes, node_rows=node_rows
+    )
+    await save_replay_artifact(
+        session, research_id, version=REPLAY_ARTIFACT_VERSION, payload=artifact
+    )
+    await session.commit()
+    return research_id
+
+
+def make_proposal(topic: str) -> ResearchProposal:
+    return ResearchProposal.model_validate(
+        {
+            "topic": topic,
+            "topic_type": "product",
+            "language": "en",
+            "complexity": {
+                "level": "epic",
+                "time_span": "1990-2025",
+                "parallel_threads": 4,
+                "estimated_total_nodes": 150,
+                "reasoning": "bench",
+            },
+            "research_threads": [
+                {"name": "t", "description": "t", "priority": 1, "estimated_nodes": 150}
+            ],
+            "estimated_duration": {"min_seconds": 1, "max_seconds": 2},
+            "credits_cost": 1,
+            "user_facing": {
+                "title": topic,
+                "summary": "bench",
+                "duration_text": "-",
+                "credits_text": "-",
+                "thread_names": ["t"],
+            },
+        }
+    )
+
+
+def make_nodes(count: int, *, revision: int = 0, changed_every: int = 0) -> list[dict]:
+    nodes = []
+    for i in range(count):
+        changed = changed_every and i % changed_every == 0
+        suffix = f" (rev {revision})" if changed else ""
+        nodes.append(
+            {
+                "id": f"ms_{i:03d}",
+                "date": f"{1990 + i % 35}-01-01",
+                "title": f"Milestone {i}{suffix}",
+                "subtitle": "bench",
+                "significance": "high",
+                "description": "A representative two or three sentence description. " * 3,
+                "details": {
+                    "key_features": [f"Feature {j} of milestone {i}{suffix}" for j in range(4)],
+                    "impact": "Impact paragraph. " * 8,
+                    "key_people": ["Someone — role", "Someone else — role"],
+                    "context": "Context paragraph. " * 8,
+                    "sources": [f"https://example.com/{i}/{j}" for j in range(5)],
+                },
+                "phase_name": "Phase",
+            }
+        )
+    return nodes
+
+
+async def time_save(factory, save, proposal: ResearchProposal, nodes: list[dict]) -> float:
+    async with factory() as session:
+        started = time.perf_counter()
+        await save(
+            session,
+            proposal=proposal,
+            nodes=nodes,
+            synthesis_data={"summary": "bench"},
+            total_nodes=len(nodes),
+            source_count=len(nodes) * 5,
+        )
+        return (time.perf_counter() - started) * 1000
+
+
+async def measure(factory, save, name: str, count: int, repeat: int) -> dict[str, float]:
+    first, unchanged, partial = [], [], []
+    for i in range(repeat):
+        proposal = make_proposal(f"bench {name} {count} #{i:04d}")
+        first.append(await time_save(factory, save, proposal, make_nodes(count)))
+        unchanged.append(await time_save(factory, save, proposal, make_nodes(count)))
+        partial.append(
+            await time_save(
+                factory, save, proposal, make_nodes(count, revision=1, changed_every=10)
+            )
+        )
+    return {
+        "first": statistics.median(first),
+        "unchanged": statistics.median(unchanged),
+        "10% changed": statistics.median(partial),
+    }
+
+
+async def run(repeat: int) -> None:
+    admin = create_async_engine(settings.database_url, poolclass=pool.NullPool)
+    async with admin.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        await conn.run_sync(Base.metadata.create_all)
+
+    engine = create_async_engine(
+        settings.database_url,
+        connect_args={"server_settings": {"search_path": f"{SCHEMA},public"}},
+    )
+    factory = lambda: AsyncSession(engine, expire_on_commit=False)  # noqa: E731
+    results: dict[tuple[str, int], dict[str, float]] = {}
+    try:
+        for count in NODE_COUNTS:
+            for name, save in (("legacy", legacy_save_research), ("batched", save_research)):
+                results[(name, count)] = await measure(factory, save, name, count, repeat)
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+    print(f"\n{'节点数':<8}{'场景':<14}{'legacy(ms)':>12}{'batched(ms)':>13}{'加速':>8}")
+    for count in NODE_COUNTS:
+        for scenario in ("first", "unchanged", "10% changed"):
+            legacy = results[("legacy", count)][scenario]
+            batched = results[("batched", count)][scenario]
+            print(
+                f"{count:<8}{scenario:<14}{legacy:>12.1f}{batched:>13.1f}{legacy / batched:>7.1f}x"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="save_research latency benchmark")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    if not settings.database_url:
+        sys.exit("DATABASE_URL is not configured")
+    asyncio.run(run(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
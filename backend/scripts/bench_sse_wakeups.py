@@ -0,0 +1,181 @@
+"""
+SSE 空闲连接唤醒基准
+
+对比旧的轮询式生成器（queue + wait_for(timeout=5) / replay_and_stream 每 0.3s 轮询）
+与当前基于 EventLog 条件通知的生成器：
+  - 空闲期间每个连接的事件循环唤醒次数
+  - 新事件到达所有订阅者的延迟
+
+不含 sse_starlette 每 15s 一次的 ping（两种实现相同）。
+
+用法：
+  python scripts/bench_sse_wakeups.py                          # 默认 100 连接、10 秒
+  python scripts/bench_sse_wakeups.py --connections 500 --seconds 30
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("TAVILY_API_KEY", "bench")
+
+from app.models.research import ResearchProposal, SSEEventType  # noqa: E402
+from app.models.session import ResearchSession  # noqa: E402
+
+
+class CallbackCounter:
+    """Counts callbacks run by the event loop; each task resumption is one callback."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._original_run = asyncio.events.Handle._run
+
+    def __enter__(self) -> "CallbackCounter":
+        counter = self
+        original = self._original_run
+
+        def counting_run(handle: asyncio.events.Handle) -> None:
+            counter.count += 1
+            original(handle)
+
+        asyncio.events.Handle._run = counting_run
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        asyncio.events.Handle._run = self._original_run
+
+
+class LegacyRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+class LegacySession:
+    """Streaming loops as they were before the shared event log."""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.history: list = []
+        self.done = False
+
+    async def push(self, item) -> None:
+        self.history.append(item)
+        await self.queue.put(item)
+
+    async def event_generator(self, request: LegacyRequest):
+        while True:
+            if await request.is_disconnected():
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout=5.0)
+            except TimeoutError:
+                continue
+            yield item
+
+    async def replay_and_stream(self, request: LegacyRequest):
+        idx = 0
+        while True:
+            if await request.is_disconnected():
+                return
+            while idx < len(self.history):
+                idx += 1
+                yield self.history[idx - 1]
+            if self.done:
+                return
+            await asyncio.sleep(0.3)
+
+
+def make_proposal() -> ResearchProposal:
+    return ResearchProposal.model_validate(
+        {
+            "topic": "bench",
+            "topic_type": "product",
+            "language": "en",
+            "complexity": {
+                "level": "light",
+                "time_span": "2000-2020",
+                "parallel_threads": 1,
+                "estimated_total_nodes": 1,
+                "reasoning": "bench",
+            },
+            "research_threads": [
+                {"name": "t", "description": "t", "priority": 1, "estimated_nodes": 1}
+            ],
+            "estimated_duration": {"min_seconds": 1, "max_seconds": 2},
+            "credits_cost": 1,
+            "user_facing": {
+                "title": "bench",
+                "summary": "bench",
+                "duration_text": "-",
+                "credits_text": "-",
+                "thread_names": ["t"],
+            },
+        }
+    )
+
+
+async def _consume(generator, arrivals: list[float]) -> None:
+    async for _ in generator:
+        arrivals.append(time.perf_counter())
+
+
+async def measure(
+    kind: str, connections: int, seconds: float, counter: CallbackCounter
+) -> tuple[float, float]:
+    arrivals: list[float] = []
+
+    if kind == "legacy":
+        session = LegacySession()
+        request = LegacyRequest()
+        # The first client drains the queue, everyone else polls the history.
+        generators = [session.event_generator(request)]
+        generators += [session.replay_and_stream(request) for _ in range(connections - 1)]
+    else:
+        session = ResearchSession("bench", make_proposal())
+        generators = [session.event_generator() for _ in range(connections)]
+
+    tasks = [asyncio.create_task(_consume(g, arrivals)) for g in generators]
+    await asyncio.sleep(0.5)  # let every subscriber reach its wait point
+
+    start = counter.count
+    await asyncio.sleep(seconds)
+    idle_wakeups = counter.count - start - 1  # minus the benchmark's own sleep
+
+    sent_at = time.perf_counter()
+    if kind == "legacy":
+        await session.push((SSEEventType.PROGRESS, {}))
+    else:
+        await session.push(SSEEventType.PROGRESS, {})
+    while len(arrivals) < connections:
+        await asyncio.sleep(0.01)
+    latency_ms = (max(arrivals) - sent_at) * 1000
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return idle_wakeups / connections / seconds * 60, latency_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SSE idle wakeup benchmark")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{args.connections} 个空闲连接，观测 {args.seconds:g} 秒\n")
+    print(f"{'实现':<10}{'唤醒/连接/分钟':>16}{'最后一个订阅者延迟(ms)':>26}")
+    for kind in ("legacy", "event_log"):
+        with CallbackCounter() as counter:
+            per_minute, latency_ms = asyncio.run(
+                measure(kind, args.connections, args.seconds, counter)
+            )
+        print(f"{kind:<10}{per_minute:>16.1f}{latency_ms:>26.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+模糊主题查找基准（pg_trgm GIN 索引 vs 旧的顺序扫描）
+
+在 DATABASE_URL 指向的库中创建临时 schema，写入 N 条研究记录，分别测量：
+  - legacy：无 trigram 索引，LIKE/ILIKE 命中全部行后按 created_at 排序
+  - trigram：GIN trigram 索引 + similarity 排序 + LIMIT 1（即 app.db.repository 当前实现）
+结束后删除临时 schema，不触碰真实数据。需要 pg_trgm 扩展的安装权限。
+
+用法：
+  python scripts/bench_topic_lookup.py                      # 默认 100000 行，每个查询 20 次
+  python scripts/bench_topic_lookup.py --rows 500000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import pool, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db.models import ResearchRow  # noqa: E402
+from app.db.repository import _topic_fuzzy_conditions, get_research_id_by_topic  # noqa: E402
+from app.utils.topic import normalize_topic  # noqa: E402
+
+SCHEMA = "bench_topic_lookup"
+TRGM_INDEXES = ("ix_researches_topic_normalized_trgm", "ix_researches_topic_trgm")
+QUERIES = ("iPhone", "cold war", "bitcoin 4242", "第二次世界大战", "quantum gravity")
+
+SEED_SQL = """
+INSERT INTO researches (
+    id, topic, topic_normalized, topic_type, language, complexity_level,
+    proposal, total_nodes, source_count, created_at, updated_at
+)
+SELECT
+    gen_random_uuid(), t.topic, lower(t.topic), 'product', 'en', 'light',
+    '{}'::jsonb, 10, 0, now() - i * interval '1 minute', now()
+FROM generate_series(1, :rows) AS i
+CROSS JOIN LATERAL (
+    SELECT (ARRAY[
+        'History of the iPhone', 'Cold War', 'Bitcoin', '第二次世界大战', 'Tesla',
+        'OpenAI', 'Internet', 'Space Race', 'Roman Empire', 'Personal computer'
+    ])[1 + i % 10] || ' ' || substr(md5(i::text), 1, 6) || ' ' || i AS topic
+) AS t
+"""
+
+
+async def legacy_research_id_by_topic(session: AsyncSession, topic: str):
+    """The lookup as it was before the trigram indexes."""
+    normalized = normalize_topic(topic)
+    result = await session.execute(
+        select(ResearchRow.id).where(ResearchRow.topic_normalized == normalized)
+    )
+    research_id = result.scalar_one_or_none()
+    if research_id is not None:
+        return research_id
+    result = await session.execute(
+        select(ResearchRow.id)
+        .where(_topic_fuzzy_conditions(topic, normalized))
+        .order_by(ResearchRow.created_at.desc())
+    )
+    return result.scalars().first()
+
+
+async def time_lookups(session: AsyncSession, lookup, repeat: int) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    for topic in QUERIES:
+        await lookup(session, topic)  # warm the buffer cache
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await lookup(session, topic)
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[topic] = statistics.median(samples)
+    return timings
+
+
+async def run(rows: int, repeat: int) -> None:
+    engine = create_async_engine(settings.database_url, poolclass=pool.NullPool)
+    async with engine.connect() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        await conn.run_sync(lambda sync_conn: ResearchRow.__table__.create(sync_conn))
+        print(f"写入 {rows} 行…")
+        await conn.execute(text(SEED_SQL), {"rows": rows})
+        await conn.commit()
+
+        try:
+            session = AsyncSession(bind=conn)
+            for name in TRGM_INDEXES:
+                await conn.execute(text(f"DROP INDEX {name}"))
+            await conn.execute(text("ANALYZE researches"))
+            legacy = await time_lookups(session, legacy_research_id_by_topic, repeat)
+
+            await conn.run_sync(
+                lambda sync_conn: [
+                    index.create(sync_conn)
+                    for index in ResearchRow.__table__.indexes
+                    if index.name in TRGM_INDEXES
+                ]
+            )
+            await conn.execute(text("ANALYZE researches"))
+            trigram = await time_lookups(session, get_research_id_by_topic, repeat)
+            await session.close()
+        finally:
+            await conn.rollback()
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            await conn.commit()
+    await engine.dispose()
+
+    print(f"\n{'查询':<20}{'legacy(ms)':>12}{'trigram(ms)':>13}{'加速':>8}")
+    for topic in QUERIES:
+        speedup = legacy[topic] / trigram[topic] if trigram[topic] else float("inf")
+        print(f"{topic:<20}{legacy[topic]:>12.2f}{trigram[topic]:>13.2f}{speedup:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fuzzy topic lookup benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if not settings.database_url:
+        sys.exit("DATABASE_URL is not configured")
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import zlib
+
+import pytest
+
+from app.config import settings
+from app.db.codec import FORMAT_JSON, FORMAT_ZLIB, CodecError, pack, unpack
+
+
+def test_small_values_are_framed_uncompressed() -> None:
+    packed = pack(b'{"a":1}')
+    assert packed == bytes((FORMAT_JSON,)) + b'{"a":1}'
+    assert unpack(packed) == b'{"a":1}'
+
+
+def test_values_above_threshold_are_compressed(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "redis_compress_threshold_bytes", 16)
+    payload = b'{"events":[' + b'"milestone",' * 200 + b'"end"]}'
+
+    packed = pack(payload)
+
+    assert packed[0] != FORMAT_JSON
+    assert len(packed) < len(payload) // 4
+    assert unpack(packed) == payload
+
+
+def test_zlib_values_decode_without_zstandard() -> None:
+    payload = b'{"topic":"iphone"}'
+    assert unpack(bytes((FORMAT_ZLIB,)) + zlib.compress(payload)) == payload
+
+
+def test_plain_json_written_before_the_codec_is_returned_as_is() -> None:
+    assert unpack(b'{"status":"proposal_ready"}') == b'{"status":"proposal_ready"}'
+    assert unpack(b"[1,2]") == b"[1,2]"
+
+
+@pytest.mark.parametrize("blob", [b"", b"\x7fgarbage"])
+def test_unknown_values_raise(blob: bytes) -> None:
+    with pytest.raises(CodecError):
+        unpack(blob)
@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import pytest
+
+from app.models.research import NodeDetail, Significance
+from app.models.runtime import RuntimeTimelineNode
+from app.models.session import ResearchSession
+from app.sse.event_publisher import (
+    SKELETON_FULL_SNAPSHOT_EVERY,
+    NodeEventBatcher,
+    push_node_detail,
+    push_skeleton,
+)
+from tests.test_session_events import make_proposal
+
+
+def make_node(node_id: str, date: str, title: str = "Event") -> RuntimeTimelineNode:
+    return RuntimeTimelineNode(
+        id=node_id,
+        date=date,
+        title=title,
+        significance=Significance.HIGH,
+        description=f"{title} happened.",
+    )
+
+
+def history(session: ResearchSession) -> list[tuple[str, dict]]:
+    return [(event.event_type.value, json.loads(event.data)) for event in session.history]
+
+
+@pytest.mark.asyncio
+async def test_push_skeleton_sends_delta_against_last_snapshot() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    nodes = [make_node(f"ms_{i:03d}", f"200{i}-01-01") for i in range(1, 7)]
+    await push_skeleton(session, nodes)
+
+    updated = [node for node in nodes if node.id != "ms_002"]
+    updated[0] = updated[0].with_date("2009-06-01")
+    updated.append(make_node("ms_007", "2000-06-01", title="Gap"))
+    updated.sort(key=lambda node: node.date)
+    await push_skeleton(session, updated)
+
+    (first_type, _), (delta_type, delta) = history(session)
+    assert first_type == "skeleton"
+    assert delta_type == "skeleton_delta"
+    assert [node["id"] for node in delta["added"]] == ["ms_007"]
+    assert delta["removed"] == ["ms_002"]
+    assert delta["changed"] == [{"id": "ms_001", "date": "2009-06-01"}]
+    assert delta["order"] == [node.id for node in updated]
+
+
+@pytest.mark.asyncio
+async def test_node_detail_updates_snapshot_so_next_delta_omits_details() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    nodes = [make_node(f"ms_{i:03d}", f"200{i}-01-01") for i in range(1, 5)]
+    await push_skeleton(session, nodes)
+
+    detailed = nodes[0].with_details(
+        NodeDetail(key_features=["Touch"], impact="Big.", key_people=[], context="Ctx.")
+    )
+    await push_node_detail(session, detailed)
+    await push_skeleton(session, [detailed, *nodes[1:], make_node("ms_005", "2009-01-01")])
+
+    event_type, delta = history(session)[-1]
+    assert event_type == "skeleton_delta"
+    assert "changed" not in delta
+    assert [node["id"] for node in delta["added"]] == ["ms_005"]
+
+
+@pytest.mark.asyncio
+async def test_push_skeleton_falls_back_to_full_snapshot_periodically() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    nodes = [make_node(f"ms_{i:03d}", f"200{i}-01-01") for i in range(1, 5)]
+    await push_skeleton(session, nodes)
+    for i in range(SKELETON_FULL_SNAPSHOT_EVERY + 1):
+        nodes = [*nodes, make_node(f"gap_{i:03d}", f"2010-01-{i + 1:02d}")]
+        await push_skeleton(session, nodes)
+
+    types = [event_type for event_type, _ in history(session)]
+    assert types == [
+        "skeleton",
+        *["skeleton_delta"] * SKELETON_FULL_SNAPSHOT_EVERY,
+        "skeleton",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_partial_skeletons_do_not_become_the_delta_base() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    await push_skeleton(session, [make_node("tmp_001", "2001-01-01")], partial=True)
+    await push_skeleton(session, [make_node("ms_001", "2001-01-01")])
+
+    assert [event_type for event_type, _ in history(session)] == ["skeleton", "skeleton"]
+
+
+def detailed(node: RuntimeTimelineNode) -> RuntimeTimelineNode:
+    return node.with_details(
+        NodeDetail(key_features=["Touch"], impact="Big.", key_people=[], context="Ctx.")
+    )
+
+
+@pytest.mark.asyncio
+async def test_node_events_within_window_are_batched() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    nodes = [make_node(f"ms_{i:03d}", f"200{i}-01-01") for i in range(1, 4)]
+
+    async with NodeEventBatcher(session, window_ms=1000) as events:
+        await events.node_progress(node_id="ms_001", model="DeepSeek", step="searching")
+        await events.node_progress(node_id="ms_002", model="DeepSeek", step="searching")
+        await events.node_progress(node_id="ms_002", model="Qwen", step="writing")
+        await events.node_progress(node_id="ms_003", model="DeepSeek", step="searching")
+        await events.node_detail(detailed(nodes[2]))
+
+    [(event_type, batch)] = history(session)
+    assert event_type == "node_batch"
+    assert batch["progress"] == [
+        {"node_id": "ms_001", "model": "DeepSeek", "step": "searching"},
+        {"node_id": "ms_002", "model": "Qwen", "step": "writing"},
+    ]
+    assert [detail["node_id"] for detail in batch["details"]] == ["ms_003"]
+
+
+@pytest.mark.asyncio
+async def test_window_flushes_single_events_unbatched() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    node = make_node("ms_001", "2001-01-01")
+
+    async with NodeEventBatcher(session, window_ms=10) as events:
+        await events.node_progress(node_id="ms_001", model="DeepSeek", step="searching")
+        await asyncio.sleep(0.05)
+        assert [event_type for event_type, _ in history(session)] == ["node_progress"]
+        await events.node_detail(detailed(node))
+
+    assert [event_type for event_type, _ in history(session)] == ["node_progress", "node_detail"]
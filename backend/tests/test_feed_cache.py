@@ -0,0 +1,129 @@
+import json
+import os
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+
+os.environ["ORCHESTRATOR_MODEL"] = "qwen/qwen-max"
+os.environ["MILESTONE_MODEL"] = "deepseek/deepseek-chat"
+os.environ["DETAIL_MODEL"] = "deepseek/deepseek-chat"
+os.environ["DEDUP_MODEL"] = "deepseek/deepseek-chat"
+os.environ["HALLUCINATION_MODEL"] = "deepseek/deepseek-chat"
+os.environ["SIMILAR_TOPIC_MODEL"] = "deepseek/deepseek-chat"
+os.environ["GAP_ANALYSIS_MODEL"] = "qwen/qwen-max"
+os.environ["SYNTHESIZER_MODEL"] = "qwen/qwen-max"
+
+from app import main
+from app.db import redis as redis_store
+from app.db.feed_cache import FeedCache
+from app.db.topic_index import CachedTopicIndex
+
+
+async def _get(path: str, *, headers: dict | None = None) -> httpx.Response:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+@pytest.fixture
+def feeds(monkeypatch) -> FeedCache:
+    cache = FeedCache(max_entries=16, ttl_seconds=300)
+    monkeypatch.setattr(main, "feed_cache", cache)
+    monkeypatch.setattr(redis_store, "feed_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def topic_index(monkeypatch) -> CachedTopicIndex:
+    index = CachedTopicIndex({"bitcoin"})
+    index.loaded = True
+    monkeypatch.setattr(main, "cached_topic_index", index)
+    monkeypatch.setattr(redis_store, "cached_topic_index", index)
+    return index
+
+
+def test_put_skips_entries_built_before_a_version_bump() -> None:
+    cache = FeedCache(max_entries=16, ttl_seconds=300)
+    version = cache.version
+    cache.bump()
+
+    stale = cache.put(("recommended", "en"), version, b"[]")
+
+    assert stale.etag.startswith('"')
+    assert cache.get(("recommended", "en")) is None
+    fresh = cache.put(("recommended", "en"), cache.version, b"[]")
+    assert cache.get(("recommended", "en")) == fresh
+    assert fresh.etag == stale.etag
+
+
+@pytest.mark.asyncio
+async def test_recommended_topics_served_from_cache_with_etag(feeds, topic_index) -> None:
+    response = await _get("/api/topics/recommended?locale=en")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, no-cache"
+    etag = response.headers["etag"]
+    topics = [topic for category in response.json() for topic in category["topics"]]
+    assert topics and not any(topic["cached"] for topic in topics)
+    assert "cached" not in main.RECOMMENDED_TOPICS["en"][0]["topics"][0]
+
+    revalidated = await _get("/api/topics/recommended?locale=en", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert feeds.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_research_saved_elsewhere_invalidates_recommended_feed(feeds, topic_index) -> None:
+    first = await _get("/api/topics/recommended?locale=en")
+
+    redis_store.handle_invalidation(f"otherworker|cached_topic|{uuid.uuid4()}|bitcoin")
+    second = await _get(
+        "/api/topics/recommended?locale=en", headers={"If-None-Match": first.headers["etag"]}
+    )
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    cached = {
+        topic["title"]
+        for category in second.json()
+        for topic in category["topics"]
+        if topic["cached"]
+    }
+    assert "Bitcoin" in cached
+
+
+@pytest.mark.asyncio
+async def test_researches_feed_caches_first_page_only(monkeypatch, feeds) -> None:
+    calls: list[object] = []
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def fake_list_researches(_db, *, locale, limit, after):
+        calls.append(after)
+        return []
+
+    monkeypatch.setattr(main, "async_session_factory", FakeSession)
+    monkeypatch.setattr(main, "list_researches", fake_list_researches)
+
+    first = await _get("/api/researches?locale=en&limit=20")
+    again = await _get("/api/researches?locale=en&limit=20")
+    cursor = main.encode_research_cursor(datetime(2025, 1, 1), uuid.uuid4())
+    paged = await _get(f"/api/researches?locale=en&limit=20&cursor={cursor}")
+    await _get(f"/api/researches?locale=en&limit=20&cursor={cursor}")
+
+    assert json.loads(first.content) == [] == json.loads(again.content)
+    assert first.headers["etag"] == again.headers["etag"] == paged.headers["etag"]
+    assert calls[0] is None and len(calls) == 3
+
+    redis_store.handle_invalidation(f"otherworker|feeds|{uuid.uuid4()}|tesla")
+    await _get("/api/researches?locale=en&limit=20")
+    assert len(calls) == 4
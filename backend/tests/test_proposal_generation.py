@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+os.environ["ORCHESTRATOR_MODEL"] = "qwen/qwen-max"
+os.environ["MILESTONE_MODEL"] = "deepseek/deepseek-chat"
+os.environ["DETAIL_MODEL"] = "deepseek/deepseek-chat"
+os.environ["DEDUP_MODEL"] = "deepseek/deepseek-chat"
+os.environ["HALLUCINATION_MODEL"] = "deepseek/deepseek-chat"
+os.environ["SIMILAR_TOPIC_MODEL"] = "deepseek/deepseek-chat"
+os.environ["GAP_ANALYSIS_MODEL"] = "qwen/qwen-max"
+os.environ["SYNTHESIZER_MODEL"] = "qwen/qwen-max"
+
+from app import main
+from app.models.research import ResearchRequest
+from tests.test_session_events import make_proposal
+
+
+@pytest.fixture
+def redis_calls(monkeypatch) -> list[tuple]:
+    calls: list[tuple] = []
+
+    async def fake_release(flight_key, token, normalized, proposal, *, session_id=None):
+        calls.append(("release", session_id))
+
+    async def fake_store_session(session_id, proposal_dict, status):
+        calls.append(("store_session", session_id))
+
+    monkeypatch.setattr(main, "release_proposal_lock", fake_release)
+    monkeypatch.setattr(main, "store_session", fake_store_session)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_fresh_proposal_stores_the_session_when_releasing_the_lock(
+    monkeypatch, redis_calls
+) -> None:
+    async def fake_acquire(flight_key):
+        return "token"
+
+    async def fake_create_proposal(request):
+        return make_proposal()
+
+    monkeypatch.setattr(main, "acquire_proposal_lock", fake_acquire)
+    monkeypatch.setattr(main.orchestrator, "create_proposal", fake_create_proposal)
+
+    request = ResearchRequest(topic="iPhone", language="en")
+    await main._generate_proposal(request, "iphone", "en:iphone", "session-1")
+
+    assert redis_calls == [("release", "session-1")]
+
+
+@pytest.mark.asyncio
+async def test_proposal_from_another_worker_is_stored_for_this_session(
+    monkeypatch, redis_calls
+) -> None:
+    async def fake_acquire(flight_key):
+        return None
+
+    async def fake_wait(flight_key, timeout):
+        return make_proposal()
+
+    async def fail_create_proposal(request):
+        raise AssertionError("the other worker's proposal must be reused")
+
+    monkeypatch.setattr(main, "acquire_proposal_lock", fake_acquire)
+    monkeypatch.setattr(main, "wait_for_proposal", fake_wait)
+    monkeypatch.setattr(main.orchestrator, "create_proposal", fail_create_proposal)
+
+    request = ResearchRequest(topic="iPhone", language="en")
+    await main._generate_proposal(request, "iphone", "en:iphone", "session-2")
+
+    assert redis_calls == [("store_session", "session-2")]
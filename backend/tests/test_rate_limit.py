@@ -0,0 +1,100 @@
+import pytest
+
+from app.config import settings
+from app.db import redis as redis_store
+from app.services import rate_limit
+from app.services.llm import RateLimitedModel, resolve_model
+
+
+class RecordingLimiter:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int]] = []
+
+    async def acquire(self, bucket: str, per_minute: int) -> None:
+        self.calls.append((bucket, per_minute))
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    recording = RecordingLimiter()
+    monkeypatch.setattr(rate_limit, "_limiter", recording)
+    monkeypatch.setattr(rate_limit, "_wait_stats", {})
+    return recording
+
+
+def test_per_model_overrides_fall_back_to_the_default(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "llm_requests_per_minute", 300)
+    monkeypatch.setattr(settings, "llm_rate_limits", "qwen/qwen-max=60, bad=x")
+    monkeypatch.setattr(settings, "tavily_requests_per_minute", 100)
+
+    assert rate_limit.requests_per_minute("llm:qwen/qwen-max") == 60
+    assert rate_limit.requests_per_minute("llm:deepseek/deepseek-chat") == 300
+    assert rate_limit.requests_per_minute("search:tavily") == 100
+
+
+@pytest.mark.asyncio
+async def test_acquire_reports_waits_per_bucket(limiter, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "tavily_requests_per_minute", 100)
+
+    await rate_limit.acquire("search:tavily")
+    await rate_limit.acquire("search:tavily")
+
+    assert limiter.calls == [("search:tavily", 100), ("search:tavily", 100)]
+    stats = rate_limit.rate_limit_stats()["search:tavily"]
+    assert stats["calls"] == 2
+    assert stats["per_minute"] == 100
+
+
+@pytest.mark.asyncio
+async def test_unlimited_buckets_skip_the_limiter(limiter, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "tavily_requests_per_minute", 0)
+
+    await rate_limit.acquire("search:tavily")
+
+    assert limiter.calls == []
+
+
+def test_resolved_models_are_rate_limited() -> None:
+    model = resolve_model("deepseek/deepseek-chat")
+
+    assert isinstance(model, RateLimitedModel)
+    assert model.bucket == "llm:deepseek/deepseek-chat"
+    assert model.model_name == "deepseek/deepseek-chat"
+
+
+class ScriptedRedis:
+    def __init__(self, waits: list[int]) -> None:
+        self.waits = waits
+        self.evals = 0
+
+    async def eval(self, script, numkeys, *args):
+        self.evals += 1
+        return self.waits.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_sleeps_until_a_token_is_free(monkeypatch) -> None:
+    fake = ScriptedRedis([20, 0])
+    monkeypatch.setattr(redis_store, "get_redis", lambda: fake)
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr(redis_store.asyncio, "sleep", fake_sleep)
+
+    await redis_store.RedisRateLimiter().acquire("llm:qwen/qwen-max", 60)
+
+    assert fake.evals == 2
+    assert len(slept) == 1 and 0.02 <= slept[0] <= 0.07
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_lets_calls_through_when_redis_fails(monkeypatch) -> None:
+    class BrokenRedis:
+        async def eval(self, *args):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(redis_store, "get_redis", lambda: BrokenRedis())
+
+    await redis_store.RedisRateLimiter().acquire("search:tavily", 100)
@@ -0,0 +1,313 @@
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.db import redis as redis_store
+from app.db.codec import FORMAT_JSON, unpack
+from app.models.research import ResearchProposal, SSEEventType
+from app.models.session import ResearchSession, SessionStatus
+from tests.test_session_events import make_proposal
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.commands: list[tuple] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self) -> list:
+        self.redis.round_trips += 1
+        self.redis.commands.extend(name for name, _, _ in self.commands)
+        return [
+            await getattr(self.redis, name)(*args, count_round_trip=False, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+def _bytes(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeRedis:
+    """Stores and returns bytes, like a client without ``decode_responses``."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, bytes] = {}
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+        self.ttls: dict[str, int] = {}
+        self.commands: list[str] = []
+        self.published: list[tuple[str, str | bytes]] = []
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self.round_trips = 0
+        self.evals: list[tuple] = []
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def _track(self, name: str, count_round_trip: bool) -> None:
+        if count_round_trip:
+            self.round_trips += 1
+            self.commands.append(name)
+
+    async def hset(self, key, mapping, *, count_round_trip=True):
+        self._track("hset", count_round_trip)
+        self.hashes.setdefault(key, {}).update(
+            {_bytes(field): _bytes(value) for field, value in mapping.items()}
+        )
+
+    async def hgetall(self, key, *, count_round_trip=True):
+        self._track("hgetall", count_round_trip)
+        return dict(self.hashes.get(key, {}))
+
+    async def expire(self, key, seconds, *, count_round_trip=True):
+        self._track("expire", count_round_trip)
+        self.ttls[key] = seconds
+
+    async def get(self, key, *, count_round_trip=True):
+        self._track("get", count_round_trip)
+        return self.strings.get(key)
+
+    async def set(self, key, value, ex=None, nx=False, *, count_round_trip=True):
+        self._track("set", count_round_trip)
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = _bytes(value)
+        self.ttls[key] = ex
+        return True
+
+    async def publish(self, channel, message, *, count_round_trip=True):
+        self._track("publish", count_round_trip)
+        self.published.append((channel, message))
+
+    async def eval(self, script, numkeys, *args, count_round_trip=True):
+        self._track("eval", count_round_trip)
+        self.evals.append(args)
+
+    async def delete(self, key, *, count_round_trip=True):
+        self._track("delete", count_round_trip)
+        self.strings.pop(key, None)
+        self.hashes.pop(key, None)
+        self.streams.pop(key, None)
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True, *, count_round_trip=True):
+        self._track("xadd", count_round_trip)
+        entries = self.streams.setdefault(key, [])
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append((entry_id, {name: str(value) for name, value in fields.items()}))
+        return entry_id
+
+    async def xread(self, streams, count=None, block=None, *, count_round_trip=True):
+        self._track("xread", count_round_trip)
+        response = []
+        for key, last_id in streams.items():
+            after = int(last_id.split("-", 1)[0])
+            entries = [
+                entry
+                for entry in self.streams.get(key, [])
+                if int(entry[0].split("-", 1)[0]) > after
+            ]
+            if entries:
+                response.append([key, entries[:count]])
+        return response
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_store, "get_redis", lambda: fake)
+    monkeypatch.setattr(redis_store, "get_binary_redis", lambda: fake)
+    redis_store.proposal_cache.clear()
+    redis_store.session_cache.clear()
+    redis_store._unflushed_hits.clear()
+    yield fake
+    redis_store.proposal_cache.clear()
+    redis_store.session_cache.clear()
+    redis_store._unflushed_hits.clear()
+
+
+@pytest.mark.asyncio
+async def test_lock_release_stores_proposal_and_session_in_one_round_trip(fake_redis) -> None:
+    proposal = make_proposal()
+    token = await redis_store.acquire_proposal_lock("en:iphone")
+    fake_redis.round_trips = 0
+
+    await redis_store.release_proposal_lock(
+        "en:iphone", token, "iphone", proposal, session_id="session-1"
+    )
+
+    assert fake_redis.round_trips == 1
+    session = fake_redis.hashes["chrono:session:v2:session-1"]
+    assert session[b"status"] == b"proposal_ready"
+    assert session[b"proposal"] == fake_redis.strings["chrono:proposal:iphone"]
+    assert (await redis_store.get_session_data("session-1"))["proposal"] == proposal
+
+
+@pytest.mark.asyncio
+async def test_status_update_writes_only_changed_fields(fake_redis) -> None:
+    proposal = make_proposal()
+    await redis_store.store_session("session-1", proposal.model_dump())
+    fake_redis.commands.clear()
+
+    await redis_store.update_session_status(
+        "session-1", "completed", cached_research_id="research-1"
+    )
+
+    assert fake_redis.commands == ["hset", "expire", "publish"]
+    assert await redis_store.get_session_data("session-1") == {
+        "proposal": proposal,
+        "status": "completed",
+        "cached_research_id": "research-1",
+    }
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_sessions_stay_readable(fake_redis) -> None:
+    proposal = make_proposal()
+    fake_redis.strings["chrono:session:session-1"] = json.dumps(
+        {"proposal": proposal.model_dump(), "status": "proposal_ready", "cached_research_id": None}
+    ).encode()
+
+    await redis_store.update_session_status("session-1", "executing")
+
+    assert await redis_store.get_session_data("session-1") == {
+        "proposal": proposal,
+        "status": "executing",
+        "cached_research_id": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_are_served_from_the_local_cache(fake_redis) -> None:
+    proposal = make_proposal()
+    fake_redis.strings["chrono:proposal:iphone"] = proposal.model_dump_json().encode()
+    await redis_store.store_session("session-1", proposal.model_dump())
+    fake_redis.commands.clear()
+
+    for _ in range(3):
+        assert await redis_store.get_cached_proposal("iphone") == proposal
+        assert (await redis_store.get_session_data("session-1"))["proposal"] == proposal
+
+    assert fake_redis.commands.count("get") == 1
+    assert fake_redis.commands.count("hgetall") == 1
+
+
+@pytest.mark.asyncio
+async def test_local_hits_refresh_the_popularity_ttl_at_most_once_per_interval(
+    fake_redis, monkeypatch
+) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(redis_store.time, "monotonic", lambda: clock[0])
+    fake_redis.strings["chrono:proposal:iphone"] = make_proposal().model_dump_json().encode()
+
+    for _ in range(5):
+        await redis_store.get_cached_proposal("iphone")
+    await asyncio.gather(*redis_store._pending_bumps)
+    assert [args[2] for args in fake_redis.evals] == [1]
+
+    clock[0] += redis_store.PROPOSAL_HITS_FLUSH_SECONDS
+    await redis_store.get_cached_proposal("iphone")
+    await asyncio.gather(*redis_store._pending_bumps)
+    # The hits held back during the interval are flushed with the next one.
+    assert [args[2] for args in fake_redis.evals] == [1, 5]
+
+
+@pytest.mark.asyncio
+async def test_invalidations_from_other_workers_evict_local_entries(fake_redis) -> None:
+    await redis_store.store_session("session-1", make_proposal().model_dump())
+    await redis_store.get_session_data("session-1")
+
+    redis_store.handle_invalidation(f"{redis_store.WORKER_ID}|session|session-1")
+    assert redis_store.session_cache.get("session-1") is not None
+
+    redis_store.handle_invalidation("otherworker|session|session-1")
+    assert redis_store.session_cache.get("session-1") is None
+
+
+@pytest.mark.asyncio
+async def test_large_proposals_are_stored_compressed(fake_redis, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "redis_compress_threshold_bytes", 64)
+    proposal = make_proposal()
+    token = await redis_store.acquire_proposal_lock("en:iphone")
+    await redis_store.release_proposal_lock("en:iphone", token, "iphone", proposal)
+
+    stored = fake_redis.strings["chrono:proposal:iphone"]
+    assert stored[0] != FORMAT_JSON
+    assert len(stored) < len(proposal.model_dump_json())
+
+    redis_store.proposal_cache.clear()
+    assert await redis_store.get_cached_proposal("iphone") == proposal
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_holds_the_proposal_lock(fake_redis) -> None:
+    token = await redis_store.acquire_proposal_lock("en:iphone")
+
+    assert token is not None
+    assert await redis_store.acquire_proposal_lock("en:iphone") is None
+    assert (
+        fake_redis.ttls["chrono:proposal_lock:en:iphone"] == settings.proposal_lock_timeout_seconds
+    )
+
+
+@pytest.mark.asyncio
+async def test_releasing_the_lock_caches_and_publishes_the_proposal(fake_redis) -> None:
+    proposal = make_proposal()
+    token = await redis_store.acquire_proposal_lock("en:iphone")
+    fake_redis.commands.clear()
+    fake_redis.round_trips = 0
+
+    await redis_store.release_proposal_lock("en:iphone", token, "iphone", proposal)
+
+    assert fake_redis.round_trips == 1
+    assert fake_redis.commands == ["set", "publish", "publish", "eval"]
+    channel, message = fake_redis.published[-1]
+    assert channel == "chrono:proposal_ready:en:iphone"
+    assert ResearchProposal.model_validate_json(unpack(message)) == proposal
+    assert await redis_store.get_cached_proposal("iphone") == proposal
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_tells_waiters_to_retry(fake_redis) -> None:
+    token = await redis_store.acquire_proposal_lock("en:iphone")
+
+    await redis_store.release_proposal_lock("en:iphone", token, "iphone", None)
+
+    assert fake_redis.published == [("chrono:proposal_ready:en:iphone", b"")]
+    assert "chrono:proposal:iphone" not in fake_redis.strings
+
+
+@pytest.mark.asyncio
+async def test_restarted_run_is_not_mixed_with_the_cancelled_one(fake_redis) -> None:
+    sink = redis_store.RedisSessionEventSink()
+    cancelled = ResearchSession("session-1", make_proposal(), event_sink=sink)
+    await cancelled.push(SSEEventType.PROGRESS, {"phase": "skeleton", "percent": 0})
+    await cancelled.push(SSEEventType.SKELETON, {"nodes": []})
+    cancelled.status = SessionStatus.PROPOSAL_READY
+    await cancelled.close()
+
+    restarted = ResearchSession("session-1", make_proposal(), event_sink=sink)
+    await restarted.push(SSEEventType.PROGRESS, {"phase": "skeleton", "percent": 0})
+
+    # Entries of the cancelled run are skipped, end marker included.
+    last_id, events, final_status = await redis_store.read_session_events(
+        "session-1", "0-0", epoch=restarted.epoch, block_ms=0
+    )
+    assert [event.frame for event in events] == [restarted.history[0].frame]
+    assert final_status is None
+    assert last_id == "4-0"
+
+    await redis_store.reset_session_events("session-1")
+    assert "chrono:events:session-1" not in fake_redis.streams
@@ -0,0 +1,118 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from app.db import redis as redis_store
+from app.db import replay
+from app.db.replay_cache import ReplayCache
+from app.models.session import ResearchSession
+from tests.test_session_events import make_proposal
+
+
+def test_cache_evicts_least_recently_used_entries_over_byte_budget() -> None:
+    cache = ReplayCache(max_bytes=10, ttl_seconds=60)
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.put(first, b"aaaa")
+    cache.put(second, b"bbbb")
+    assert cache.get(first) == b"aaaa"
+
+    cache.put(third, b"cccc")
+
+    assert cache.get(second) is None
+    assert cache.get(first) == b"aaaa"
+    assert cache.get(third) == b"cccc"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_cache_expires_and_invalidates_entries() -> None:
+    cache = ReplayCache(max_bytes=100, ttl_seconds=60)
+    research_id = uuid.uuid4()
+    cache.put(research_id, b"artifact")
+    cache._entries[research_id] = (b"artifact", time.monotonic() - 61)
+    assert cache.get(research_id) is None
+
+    cache.put(research_id, b"artifact")
+    cache.invalidate(research_id)
+    assert cache.get(research_id) is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_research_saved_on_another_worker_drops_the_local_artifact(monkeypatch) -> None:
+    cache = ReplayCache(max_bytes=100, ttl_seconds=60)
+    monkeypatch.setattr(redis_store, "replay_cache", cache)
+    saved, untouched = uuid.uuid4(), uuid.uuid4()
+    cache.put(saved, b"old artifact")
+    cache.put(untouched, b"artifact")
+
+    redis_store.handle_invalidation(f"otherworker|feeds|{saved}|iphone")
+
+    assert cache.get(saved) is None
+    assert cache.get(untouched) == b"artifact"
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_do_not_extend_the_ttl(monkeypatch) -> None:
+    cache = ReplayCache(max_bytes=100, ttl_seconds=60)
+    monkeypatch.setattr(replay, "replay_cache", cache)
+    research_id = uuid.uuid4()
+    stored_at = time.monotonic() - 30
+    cache._entries[research_id] = (b"artifact", stored_at)
+
+    session = ResearchSession("session-1", make_proposal(), cached_research_id=research_id)
+    assert await replay.prepare_replay(session, research_id) == b"artifact"
+
+    assert cache._entries[research_id][1] == stored_at
+
+
+class FakePubSub:
+    def __init__(self, listens) -> None:
+        self.listens = listens
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    async def subscribe(self, channel) -> None:
+        return None
+
+    def listen(self):
+        return self.listens.pop(0)()
+
+
+@pytest.mark.asyncio
+async def test_resubscribing_drops_every_local_cache(monkeypatch) -> None:
+    cache = ReplayCache(max_bytes=100, ttl_seconds=60)
+    monkeypatch.setattr(redis_store, "replay_cache", cache)
+    monkeypatch.setattr(redis_store, "INVALIDATION_RESUBSCRIBE_DELAY", 0)
+    research_id = uuid.uuid4()
+    cache.put(research_id, b"artifact")
+    redis_store.session_cache.put("session-1", {"status": "executing"})
+
+    async def disconnect():
+        # The first subscribe keeps the warmed artifacts.
+        assert cache.get(research_id) == b"artifact"
+        raise ConnectionError("connection lost")
+        yield
+
+    async def stop():
+        raise asyncio.CancelledError
+        yield
+
+    pubsub = FakePubSub([disconnect, stop])
+
+    class FakeRedis:
+        def pubsub(self, **kwargs) -> FakePubSub:
+            return pubsub
+
+    monkeypatch.setattr(redis_store, "get_redis", lambda: FakeRedis())
+
+    with pytest.raises(asyncio.CancelledError):
+        await redis_store.listen_for_invalidations()
+
+    assert cache.get(research_id) is None
+    assert redis_store.session_cache.get("session-1") is None
+    assert not redis_store.cached_topic_index.loaded
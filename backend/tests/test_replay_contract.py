@@ -1,9 +1,11 @@
+import json
 import uuid
 from types import SimpleNamespace
 
 import pytest
 
 from app.db import replay
+from app.db.replay_cache import replay_cache
 from app.models.research import ResearchProposal
 from app.models.session import ResearchSession, SessionStatus
 
@@ -42,10 +44,15 @@ def make_proposal() -> ResearchProposal:
     )
 
 
-@pytest.mark.asyncio
-async def test_replay_research_pushes_cached_events_in_frontend_order(monkeypatch) -> None:
-    research_id = uuid.uuid4()
-    research = SimpleNamespace(
+@pytest.fixture(autouse=True)
+def empty_replay_cache():
+    replay_cache.clear()
+    yield
+    replay_cache.clear()
+
+
+def make_research() -> SimpleNamespace:
+    return SimpleNamespace(
         total_nodes=1,
         synthesis={
             "summary": "iPhone changed smartphones.",
@@ -57,7 +64,10 @@ async def test_replay_research_pushes_cached_events_in_frontend_order(monkeypatc
             "date_corrections": [],
         },
     )
-    node_rows = [
+
+
+def make_node_rows() -> list[SimpleNamespace]:
+    return [
         SimpleNamespace(
             node_id="ms_001",
             date="2007-01-09",
@@ -76,8 +86,18 @@ async def test_replay_research_pushes_cached_events_in_frontend_order(monkeypatc
             is_gap_node=False,
         )
     ]
+
+
+@pytest.mark.asyncio
+async def test_replay_research_pushes_cached_events_in_frontend_order(monkeypatch) -> None:
+    research_id = uuid.uuid4()
+    research = make_research()
+    node_rows = make_node_rows()
     status_updates: list[tuple[str, str, uuid.UUID | None]] = []
 
+    async def fake_load_replay_artifact(requested_research_id):
+        return None
+
     async def fake_load_research_snapshot(requested_research_id):
         assert requested_research_id == research_id
         return research, node_rows
@@ -85,6 +105,7 @@ async def test_replay_research_pushes_cached_events_in_frontend_order(monkeypatc
     async def fake_update_session_status(session_id, status, *, cached_research_id=None):
         status_updates.append((session_id, status, cached_research_id))
 
+    monkeypatch.setattr(replay, "_load_replay_artifact", fake_load_replay_artifact)
     monkeypatch.setattr(replay, "_load_research_snapshot", fake_load_research_snapshot)
     monkeypatch.setattr(replay, "update_session_status", fake_update_session_status)
 
@@ -96,15 +117,124 @@ async def test_replay_research_pushes_cached_events_in_frontend_order(monkeypatc
 
     await replay.replay_research(session, research_id)
 
-    assert [event_type.value for event_type, _payload in session._event_history] == [
+    payloads = [json.loads(event.data) for event in session.history]
+    assert [event.event_type.value for event in session.history] == [
         "skeleton",
         "node_detail",
         "synthesis",
         "complete",
     ]
     assert session.status == SessionStatus.COMPLETED
-    assert session._event_history[0][1]["nodes"][0]["id"] == "ms_001"
-    assert session._event_history[1][1]["node_id"] == "ms_001"
-    assert session._event_history[2][1]["summary"] == "iPhone changed smartphones."
-    assert session._event_history[3][1] == {"total_nodes": 1, "detail_completed": 1}
+    assert payloads[0]["nodes"][0]["id"] == "ms_001"
+    assert payloads[1]["node_id"] == "ms_001"
+    assert payloads[2]["summary"] == "iPhone changed smartphones."
+    assert payloads[3] == {"total_nodes": 1, "detail_completed": 1}
     assert status_updates == [("session-1", "completed", research_id)]
+
+
+@pytest.mark.asyncio
+async def test_replay_from_artifact_streams_the_same_frames(monkeypatch) -> None:
+    research_id = uuid.uuid4()
+    artifact = await replay.build_replay_artifact(
+        make_proposal(),
+        synthesis=make_research().synthesis,
+        total_nodes=1,
+        node_rows=make_node_rows(),
+    )
+
+    async def fake_load_replay_artifact(requested_research_id):
+        assert requested_research_id == research_id
+        return artifact
+
+    async def fake_load_research_snapshot(requested_research_id):
+        return make_research(), make_node_rows()
+
+    async def fake_update_session_status(session_id, status, *, cached_research_id=None):
+        return None
+
+    monkeypatch.setattr(replay, "update_session_status", fake_update_session_status)
+    monkeypatch.setattr(replay, "_load_research_snapshot", fake_load_research_snapshot)
+
+    monkeypatch.setattr(replay, "_load_replay_artifact", fake_load_replay_artifact)
+    from_artifact = ResearchSession("session-1", make_proposal(), cached_research_id=research_id)
+    await replay.replay_research(from_artifact, research_id)
+
+    async def no_artifact(requested_research_id):
+        return None
+
+    monkeypatch.setattr(replay, "_load_replay_artifact", no_artifact)
+    rebuilt = ResearchSession("session-2", make_proposal(), cached_research_id=research_id)
+    await replay.replay_research(rebuilt, research_id)
+
+    assert from_artifact.status == SessionStatus.COMPLETED
+    assert [event.frame for event in from_artifact.history] == [
+        event.frame for event in rebuilt.history
+    ]
+    assert [event.key for event in from_artifact.history] == [
+        event.key for event in rebuilt.history
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repeated_replays_are_served_from_the_process_cache(monkeypatch) -> None:
+    research_id = uuid.uuid4()
+    loads: list[str] = []
+
+    async def fake_load_replay_artifact(requested_research_id):
+        loads.append("artifact")
+        return None
+
+    async def fake_load_research_snapshot(requested_research_id):
+        loads.append("snapshot")
+        return make_research(), make_node_rows()
+
+    async def fake_update_session_status(session_id, status, *, cached_research_id=None):
+        return None
+
+    monkeypatch.setattr(replay, "_load_replay_artifact", fake_load_replay_artifact)
+    monkeypatch.setattr(replay, "_load_research_snapshot", fake_load_research_snapshot)
+    monkeypatch.setattr(replay, "update_session_status", fake_update_session_status)
+
+    first = ResearchSession("session-1", make_proposal(), cached_research_id=research_id)
+    await replay.replay_research(first, research_id)
+    second = ResearchSession("session-2", make_proposal(), cached_research_id=research_id)
+    await replay.replay_research(second, research_id)
+
+    assert loads == ["artifact", "snapshot"]
+    assert [event.frame for event in second.history] == [event.frame for event in first.history]
+
+
+@pytest.mark.asyncio
+async def test_replay_epoch_changes_when_the_research_is_rewritten(monkeypatch) -> None:
+    research_id = uuid.uuid4()
+    research = make_research()
+
+    async def no_artifact(requested_research_id):
+        return None
+
+    async def fake_load_research_snapshot(requested_research_id):
+        return research, make_node_rows()
+
+    async def fake_update_session_status(session_id, status, *, cached_research_id=None):
+        return None
+
+    monkeypatch.setattr(replay, "_load_replay_artifact", no_artifact)
+    monkeypatch.setattr(replay, "_load_research_snapshot", fake_load_research_snapshot)
+    monkeypatch.setattr(replay, "update_session_status", fake_update_session_status)
+
+    first = ResearchSession("session-1", make_proposal(), cached_research_id=research_id)
+    await replay.replay_research(first, research_id)
+    restored = ResearchSession("session-1", make_proposal(), cached_research_id=research_id)
+    await replay.prepare_replay(restored, research_id)
+    assert restored.epoch == first.epoch
+    last_seen = f"{first.epoch}.2"
+    assert restored.resume_offset(last_seen) == 2
+
+    # A re-run overwrote the research under the same id.
+    replay_cache.invalidate(research_id)
+    research.synthesis = {**research.synthesis, "summary": "Rewritten summary."}
+    rerun = ResearchSession("session-1", make_proposal(), cached_research_id=research_id)
+    await replay.prepare_replay(rerun, research_id)
+
+    assert rerun.epoch != first.epoch
+    assert rerun.resume_offset(last_seen) == 0
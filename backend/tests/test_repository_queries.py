@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import uuid
+from datetime import UTC, datetime
 from typing import Any
 
 import pytest
 
 from app.db.repository import (
+    decode_research_cursor,
+    encode_research_cursor,
     get_cached_research_proposal_by_id,
     get_cached_research_proposal_by_topic,
     get_nodes_for_research_replay,
@@ -138,6 +141,8 @@ async def test_cached_research_proposal_lookup_selects_only_proposal_payload() -
         assert selected_column_keys(statement) == {"id", "proposal"}
     assert "researches.topic_normalized = 'iphone'" in exact_sql
     assert "researches.topic_normalized LIKE '%' || 'iphone' || '%'" in fuzzy_sql
+    assert "ORDER BY similarity(researches.topic_normalized, 'iphone') DESC" in fuzzy_sql
+    assert "LIMIT 1" in fuzzy_sql
     assert "researches.synthesis" not in exact_sql
     assert "researches.synthesis" not in fuzzy_sql
 
@@ -174,41 +179,87 @@ async def test_research_id_lookup_selects_only_id() -> None:
     assert "researches.synthesis" not in fuzzy_sql
 
 
+SAVED_NODE = {
+    "id": "ms_001",
+    "date": "2007-01-09",
+    "title": "iPhone announced",
+    "subtitle": "Apple",
+    "significance": "revolutionary",
+    "description": "Apple announced the first iPhone.",
+    "details": {
+        "key_features": ["Multi-touch smartphone"],
+        "impact": "It reshaped the smartphone market.",
+        "key_people": ["Steve Jobs — Apple CEO"],
+        "context": "Apple combined phone, iPod, and internet communicator.",
+        "sources": ["https://example.com"],
+    },
+    "phase_name": "Launch",
+}
+
+
 @pytest.mark.asyncio
 async def test_save_research_updates_existing_row_without_loading_full_research() -> None:
-    session = CapturingSession(execute_rows=[[RESEARCH_ID], [], []])
+    session = CapturingSession(execute_rows=[[RESEARCH_ID], [], [], [], []])
 
     research_id = await save_research(
         session,
         proposal=make_proposal(),
-        nodes=[
-            {
-                "id": "ms_001",
-                "date": "2007-01-09",
-                "title": "iPhone announced",
-                "subtitle": "Apple",
-                "significance": "revolutionary",
-                "description": "Apple announced the first iPhone.",
-                "details": {"sources": ["https://example.com"]},
-                "phase_name": "Launch",
-            }
-        ],
-        synthesis_data={"summary": "iPhone changed smartphones."},
+        nodes=[SAVED_NODE],
+        synthesis_data={
+            "summary": "iPhone changed smartphones.",
+            "timeline_span": "2007 - 2025",
+            "key_insight": "Software ate the phone.",
+        },
         total_nodes=1,
         source_count=1,
     )
 
     lookup_sql = compile_sql(session.statements[0])
     update_sql = str(session.statements[1])
-    delete_sql = compile_sql(session.statements[2])
+    upsert_sql = str(session.statements[2])
+    delete_sql = compile_sql(session.statements[3])
     assert research_id == RESEARCH_ID
     assert selected_column_keys(session.statements[0]) == {"id"}
     assert "researches.proposal" not in lookup_sql
     assert "researches.synthesis" not in lookup_sql
     assert update_sql.startswith("UPDATE researches SET")
+    assert session.statements[1].compile().params["timeline_span"] == "2007 - 2025"
+    assert session.statements[1].compile().params["key_insight"] == "Software ate the phone."
+    assert upsert_sql.startswith("INSERT INTO timeline_nodes")
+    assert "ON CONFLICT (research_id, node_id) DO UPDATE" in upsert_sql
+    assert "IS DISTINCT FROM (excluded.date" in upsert_sql
     assert f"timeline_nodes.research_id = {RESEARCH_ID_SQL}" in delete_sql
-    assert session.added[0].research_id == RESEARCH_ID
-    assert session.flush_count == 1
+    assert "timeline_nodes.node_id NOT IN ('ms_001')" in delete_sql
+    artifact_sql = str(session.statements[4])
+    assert artifact_sql.startswith("INSERT INTO research_replays")
+    assert "ON CONFLICT (research_id) DO UPDATE" in artifact_sql
+    assert session.added == []
+    assert session.flush_count == 0
+    assert session.commit_count == 1
+
+
+@pytest.mark.asyncio
+async def test_save_research_inserts_all_nodes_in_one_statement() -> None:
+    session = CapturingSession(execute_rows=[[], [], [], [], []])
+    nodes = [{**SAVED_NODE, "id": f"ms_{i:03d}"} for i in range(150)]
+
+    research_id = await save_research(
+        session,
+        proposal=make_proposal(),
+        nodes=nodes,
+        synthesis_data=None,
+        total_nodes=150,
+        source_count=1,
+    )
+
+    insert_research = session.statements[2]
+    insert_nodes = session.statements[3]
+    assert str(insert_research).startswith("INSERT INTO researches")
+    assert insert_research.compile().params["id"] == research_id
+    assert str(insert_nodes).startswith("INSERT INTO timeline_nodes")
+    assert insert_nodes.compile().params["node_id_m149"] == "ms_149"
+    assert not any(str(statement).startswith("DELETE") for statement in session.statements)
+    assert str(session.statements[4]).startswith("INSERT INTO research_replays")
     assert session.commit_count == 1
 
 
@@ -255,13 +306,33 @@ async def test_list_researches_pushes_locale_and_limit_into_query() -> None:
     await list_researches(session, locale="zh", limit=12)
 
     sql = compile_sql(session.statement)
-    assert "researches.language LIKE 'zh%'" in sql
+    assert "split_part(researches.language, '-', 1) = 'zh'" in sql
     assert "LIMIT 12" in sql
     assert "researches.proposal" not in sql
-    assert "synthesis" not in selected_column_keys(session.statement)
+    assert "synthesis" not in sql
     assert {"timeline_span", "key_insight"}.issubset(selected_column_keys(session.statement))
 
 
+@pytest.mark.asyncio
+async def test_list_researches_continues_after_the_cursor_row() -> None:
+    session = CapturingSession()
+    created_at = datetime(2026, 10, 1, 12, 30, tzinfo=UTC)
+    cursor = encode_research_cursor(created_at, RESEARCH_ID)
+
+    await list_researches(session, locale="en", limit=51, after=decode_research_cursor(cursor))
+
+    sql = compile_sql(session.statement)
+    assert "(researches.created_at, researches.id) < ('2026-10-01 12:30:00+00:00', " in sql
+    assert "ORDER BY researches.created_at DESC, researches.id DESC" in sql
+    assert decode_research_cursor(cursor) == (created_at, RESEARCH_ID)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!!"])
+def test_malformed_cursors_are_rejected(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_research_cursor(cursor)
+
+
 @pytest.mark.asyncio
 async def test_list_cached_topic_normalized_selects_only_normalized_topics() -> None:
     session = CapturingSession(["history of iphone", "world war ii"])
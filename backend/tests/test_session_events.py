@@ -1,14 +1,10 @@
+import asyncio
 import json
 
 import pytest
 
 from app.models.research import ResearchProposal, SSEEventType
-from app.models.session import ResearchSession, SessionStatus
-
-
-class NeverDisconnectedRequest:
-    async def is_disconnected(self) -> bool:
-        return False
+from app.models.session import SUBSCRIBER_MAX_LAG, ResearchSession, SessionStatus
 
 
 def make_proposal() -> ResearchProposal:
@@ -45,8 +41,21 @@ def make_proposal() -> ResearchProposal:
     )
 
 
-def event_payload(event) -> dict:
-    return json.loads(event.data)
+def parse_frame(frame: bytes) -> dict[str, str]:
+    fields: dict[str, str] = {}
+    for line in frame.decode().split("\r\n"):
+        if line:
+            name, _, value = line.partition(": ")
+            fields[name] = value
+    return fields
+
+
+def event_name(frame: bytes) -> str:
+    return parse_frame(frame)["event"]
+
+
+def event_payload(frame: bytes) -> dict:
+    return json.loads(parse_frame(frame)["data"])
 
 
 @pytest.mark.asyncio
@@ -57,22 +66,165 @@ async def test_push_records_history_and_live_generator_yields_event() -> None:
 
     assert session.has_events is True
 
-    generator = session.event_generator(NeverDisconnectedRequest())
+    generator = session.event_generator()
     event = await generator.__anext__()
 
-    assert event.event == "progress"
+    assert event_name(event) == "progress"
     assert event_payload(event) == {"phase": "skeleton", "percent": 10}
 
 
 @pytest.mark.asyncio
-async def test_replay_and_stream_replays_history_after_completion() -> None:
+async def test_event_generator_replays_history_after_completion() -> None:
     session = ResearchSession("session-1", make_proposal())
     await session.push(SSEEventType.SKELETON, {"nodes": [{"id": "ms_001"}]})
     await session.push(SSEEventType.COMPLETE, {"total_nodes": 1, "detail_completed": 1})
     session.status = SessionStatus.COMPLETED
+    await session.close()
 
-    events = [event async for event in session.replay_and_stream(NeverDisconnectedRequest())]
+    events = [event async for event in session.event_generator()]
 
-    assert [event.event for event in events] == ["skeleton", "complete"]
+    assert [event_name(event) for event in events] == ["skeleton", "complete"]
     assert event_payload(events[0]) == {"nodes": [{"id": "ms_001"}]}
     assert event_payload(events[1]) == {"total_nodes": 1, "detail_completed": 1}
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_receives_live_events() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    await session.push(SSEEventType.PROGRESS, {"phase": "skeleton", "percent": 0})
+
+    async def collect() -> list[str]:
+        return [event_name(event) async for event in session.event_generator()]
+
+    subscribers = [asyncio.create_task(collect()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert session.subscriber_count == 3
+
+    await session.push(SSEEventType.SKELETON, {"nodes": []})
+    await session.push(SSEEventType.COMPLETE, {"total_nodes": 0, "detail_completed": 0})
+    await session.close()
+
+    results = await asyncio.gather(*subscribers)
+    assert results == [["progress", "skeleton", "complete"]] * 3
+    assert session.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_push_encodes_once_and_subscribers_share_the_frame() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    await session.push(
+        SSEEventType.NODE_DETAIL, {"node_id": "ms_001", "details": {"impact": "改变"}}
+    )
+    await session.close()
+
+    first = [frame async for frame in session.event_generator()]
+    second = [frame async for frame in session.event_generator()]
+
+    assert first[0] is second[0] is session.history[0].frame
+    assert event_payload(first[0])["details"]["impact"] == "改变"
+    assert session.history_bytes == len(first[0])
+
+
+@pytest.mark.asyncio
+async def test_event_ids_allow_resuming_after_last_seen_event() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    await session.push(SSEEventType.PROGRESS, {"phase": "skeleton", "percent": 0})
+    await session.push(SSEEventType.SKELETON, {"nodes": []})
+    await session.push(SSEEventType.COMPLETE, {"total_nodes": 0, "detail_completed": 0})
+    await session.close()
+
+    ids = [parse_frame(event.frame)["id"] for event in session.history]
+    offset = session.resume_offset(ids[0])
+    resumed = [event_name(frame) async for frame in session.event_generator(offset)]
+
+    assert ids == [f"{session.epoch}.1", f"{session.epoch}.2", f"{session.epoch}.3"]
+    assert resumed == ["skeleton", "complete"]
+    assert session.resume_offset("other-run.2") == 0
+    assert session.resume_offset(None) == 0
+
+
+@pytest.mark.asyncio
+async def test_late_joiners_receive_compacted_history() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    await session.push(SSEEventType.PROGRESS, {"phase": "skeleton", "percent": 0})
+    await session.push(SSEEventType.SKELETON, {"nodes": [{"id": "tmp_001"}], "partial": True})
+    await session.push(SSEEventType.PROGRESS, {"phase": "skeleton", "percent": 20})
+    await session.push(SSEEventType.SKELETON, {"nodes": [{"id": "ms_001"}]})
+    await session.push(SSEEventType.PROGRESS, {"phase": "detail", "percent": 40})
+    await session.push(SSEEventType.NODE_PROGRESS, {"node_id": "ms_001", "step": "searching"})
+    await session.push(SSEEventType.NODE_PROGRESS, {"node_id": "ms_002", "step": "searching"})
+    await session.push(SSEEventType.NODE_DETAIL, {"node_id": "ms_001", "details": {}})
+    await session.push(SSEEventType.SKELETON, {"nodes": [{"id": "ms_001"}, {"id": "ms_002"}]})
+    await session.push(SSEEventType.SKELETON_DELTA, {"removed": ["ms_002"]})
+
+    late = [parse_frame(frame) async for frame in _take(session.event_generator(), 5)]
+
+    assert [(frame["event"], frame["id"].rpartition(".")[2]) for frame in late] == [
+        ("progress", "3"),
+        ("progress", "5"),
+        ("node_progress", "7"),
+        ("skeleton", "9"),
+        ("skeleton_delta", "10"),
+    ]
+    await session.push(SSEEventType.COMPLETE, {"total_nodes": 1, "detail_completed": 1})
+    await session.close()
+    resumed = [event_name(frame) async for frame in session.event_generator(offset=10)]
+    assert resumed == ["complete"]
+
+
+def _progress(node_id: str) -> dict:
+    return {"node_id": node_id, "model": "m", "step": "researching"}
+
+
+def _detail(node_id: str) -> dict:
+    return {"node_id": node_id, "details": {}}
+
+
+@pytest.mark.asyncio
+async def test_compaction_drops_superseded_node_batches() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    await session.push(
+        SSEEventType.NODE_BATCH, {"progress": [_progress("ms_001"), _progress("ms_002")]}
+    )
+    await session.push(SSEEventType.NODE_BATCH, {"details": [_detail("ms_001"), _detail("ms_002")]})
+    await session.push(SSEEventType.SKELETON, {"nodes": [{"id": "ms_001"}, {"id": "ms_002"}]})
+    # Progress for a node still being researched survives; stale progress does not.
+    await session.push(
+        SSEEventType.NODE_BATCH, {"progress": [_progress("ms_003"), _progress("ms_001")]}
+    )
+    await session.push(SSEEventType.NODE_BATCH, {"progress": [_progress("ms_002")], "details": []})
+    await session.push(
+        SSEEventType.NODE_BATCH, {"progress": [_progress("ms_004")], "details": [_detail("ms_005")]}
+    )
+
+    _, compacted = session.compacted_history()
+
+    assert [(event.event_type.value, event.seq) for event in compacted] == [
+        ("skeleton", 3),
+        ("node_batch", 4),
+        ("node_batch", 6),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_lagging_subscriber_catches_up_with_compacted_backlog() -> None:
+    session = ResearchSession("session-1", make_proposal())
+    await session.push(SSEEventType.SKELETON, {"nodes": [{"id": "ms_001"}]})
+    generator = session.event_generator()
+    assert event_name(await generator.__anext__()) == "skeleton"
+
+    for percent in range(SUBSCRIBER_MAX_LAG + 1):
+        await session.push(SSEEventType.PROGRESS, {"phase": "detail", "percent": percent})
+    await session.push(SSEEventType.NODE_DETAIL, {"node_id": "ms_001", "details": {}})
+    await session.close()
+
+    rest = [parse_frame(frame) async for frame in generator]
+    assert [frame["event"] for frame in rest] == ["progress", "node_detail"]
+    assert json.loads(rest[0]["data"])["percent"] == SUBSCRIBER_MAX_LAG
+    assert session.subscriber_count == 0
+
+
+async def _take(generator, count: int):
+    for _ in range(count):
+        yield await generator.__anext__()
+    await generator.aclose()
@@ -1,10 +1,14 @@
+import asyncio
+import contextlib
 import uuid
 
 import pytest
 
+from app.models.research import SSEEventType
 from app.models.session import SessionManager, SessionStatus
 from app.session import lifecycle
 from app.session.lifecycle import SessionLifecycleService
+from tests.test_session_events import make_proposal
 
 
 class FakeAsyncSessionFactory:
@@ -52,3 +56,320 @@ async def test_reconcile_cached_research_uses_id_only_lookup(monkeypatch) -> Non
     assert status == SessionStatus.EXECUTING
     assert factory.enter_count == 1
     assert calls == [(factory.session, "iPhone")]
+
+
+class FakeRequest:
+    def __init__(self, *, headers: dict[str, str], query_params: dict[str, str]) -> None:
+        self.headers = headers
+        self.query_params = query_params
+
+
+@pytest.mark.asyncio
+async def test_stream_response_resumes_from_last_event_id_header() -> None:
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal(), status=SessionStatus.COMPLETED)
+    await session.push(SSEEventType.SKELETON, {"nodes": []})
+    await session.push(SSEEventType.COMPLETE, {"total_nodes": 0, "detail_completed": 0})
+    await session.close()
+
+    async def never_execute(_session) -> None:
+        raise AssertionError("completed sessions must not re-run research")
+
+    response = await SessionLifecycleService(manager).create_stream_response(
+        session,
+        FakeRequest(headers={"last-event-id": f"{session.epoch}.1"}, query_params={}),
+        execute_research=never_execute,
+    )
+
+    frames = [frame async for frame in response.generator]
+    assert frames == [session.history[1].frame]
+
+
+class RecordingEventSink:
+    def __init__(self) -> None:
+        self.events = []
+        self.closed: list[SessionStatus] = []
+
+    async def append(self, session_id, epoch, event) -> None:
+        self.events.append((session_id, epoch, event))
+
+    async def close(self, session_id, epoch, status) -> None:
+        self.closed.append(status)
+
+
+@pytest.mark.asyncio
+async def test_executing_session_on_another_worker_is_followed_from_its_stream(
+    monkeypatch,
+) -> None:
+    sink = RecordingEventSink()
+    origin = SessionManager(event_sink=sink).create(
+        "session-1",
+        make_proposal(),
+        status=SessionStatus.EXECUTING,
+    )
+    await origin.push(SSEEventType.SKELETON, {"nodes": []})
+    await origin.push(SSEEventType.COMPLETE, {"total_nodes": 0, "detail_completed": 0})
+    origin.status = SessionStatus.COMPLETED
+    await origin.close()
+    assert sink.closed == [SessionStatus.COMPLETED]
+
+    async def fake_get_session_data(session_id: str):
+        return {"proposal": make_proposal(), "status": "executing"}
+
+    async def fake_tail(session_id: str):
+        return origin.epoch, 1.0, False
+
+    reads = iter(
+        [
+            ("1-0", [event for _, _, event in sink.events[:1]], None),
+            ("2-0", [event for _, _, event in sink.events[1:]], SessionStatus.COMPLETED),
+        ]
+    )
+
+    async def fake_read_session_events(session_id: str, last_id: str, *, epoch: str, block_ms: int):
+        assert epoch == origin.epoch
+        return next(reads)
+
+    monkeypatch.setattr(lifecycle, "get_session_data", fake_get_session_data)
+    monkeypatch.setattr(lifecycle, "get_session_events_tail", fake_tail)
+    monkeypatch.setattr(lifecycle, "read_session_events", fake_read_session_events)
+
+    follower_sink = RecordingEventSink()
+    service = SessionLifecycleService(SessionManager(event_sink=follower_sink))
+    follower = await service.get_or_restore_session("session-1")
+    assert follower is not None
+    await follower.task
+
+    assert follower.status == SessionStatus.COMPLETED
+    assert follower.epoch == origin.epoch
+    assert [event.frame for event in follower.history] == [event.frame for event in origin.history]
+    assert follower_sink.events == []
+    assert follower_sink.closed == []
+
+
+@pytest.mark.asyncio
+async def test_stream_response_is_compressed_when_client_accepts_gzip() -> None:
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal(), status=SessionStatus.COMPLETED)
+    await session.close()
+
+    async def never_execute(_session) -> None:
+        raise AssertionError("completed sessions must not re-run research")
+
+    response = await SessionLifecycleService(manager).create_stream_response(
+        session,
+        FakeRequest(headers={"accept-encoding": "gzip, deflate, br"}, query_params={}),
+        execute_research=never_execute,
+    )
+
+    assert response.encoding == "gzip"
+    assert response.kwargs["headers"]["Content-Encoding"] == "gzip"
+    assert response.kwargs["headers"]["X-Accel-Buffering"] == "no"
+
+
+@pytest.mark.asyncio
+async def test_abandoned_run_is_cancelled_after_grace_period(monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_grace_seconds", 0.01)
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_policy", "cancel")
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal())
+    cancelled = asyncio.Event()
+
+    async def execute_forever(_session) -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    service = SessionLifecycleService(manager)
+    await service._start_session(session, execute_forever)
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.gather(*service._watchdogs)
+
+    assert session.task.cancelled()
+    assert manager.get("session-1") is None
+
+
+@pytest.mark.asyncio
+async def test_run_followed_from_another_worker_is_not_cancelled(monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_grace_seconds", 0.01)
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_policy", "cancel")
+    watchers = iter([1, 1, 0])
+    checks: list[str] = []
+
+    async def fake_count_session_watchers(session_id: str) -> int:
+        checks.append(session_id)
+        return next(watchers)
+
+    monkeypatch.setattr(lifecycle, "count_session_watchers", fake_count_session_watchers)
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal())
+
+    async def execute_forever(_session) -> None:
+        await asyncio.Event().wait()
+
+    service = SessionLifecycleService(manager)
+    await service._start_session(session, execute_forever)
+    await asyncio.wait_for(asyncio.gather(*service._watchdogs), 1)
+
+    assert checks == ["session-1"] * 3
+    assert session.task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_live_run_starts_on_a_fresh_event_stream(monkeypatch) -> None:
+    resets: list[str] = []
+
+    async def fake_reset_session_events(session_id: str) -> None:
+        resets.append(session_id)
+
+    monkeypatch.setattr(lifecycle, "reset_session_events", fake_reset_session_events)
+    session = SessionManager().create("session-1", make_proposal())
+
+    async def execute_nothing(_session) -> None:
+        assert resets == ["session-1"]
+
+    service = SessionLifecycleService(SessionManager())
+    await service._start_session(session, execute_nothing)
+    await session.task
+
+    assert resets == ["session-1"]
+
+
+@pytest.mark.asyncio
+async def test_follower_of_a_cancelled_run_is_discarded(monkeypatch) -> None:
+    async def fake_get_session_data(session_id: str):
+        return {"proposal": make_proposal(), "status": "executing"}
+
+    async def fake_tail(session_id: str):
+        return "run-1", 1.0, False
+
+    async def fake_read_session_events(session_id: str, last_id: str, *, epoch: str, block_ms: int):
+        return "1-0", [], SessionStatus.PROPOSAL_READY
+
+    monkeypatch.setattr(lifecycle, "get_session_data", fake_get_session_data)
+    monkeypatch.setattr(lifecycle, "get_session_events_tail", fake_tail)
+    monkeypatch.setattr(lifecycle, "read_session_events", fake_read_session_events)
+
+    manager = SessionManager()
+    service = SessionLifecycleService(manager)
+    follower = await service.get_or_restore_session("session-1")
+    assert follower is not None
+    await follower.task
+
+    assert follower.status == SessionStatus.PROPOSAL_READY
+    assert manager.get("session-1") is None
+
+
+@pytest.mark.asyncio
+async def test_abandoned_run_can_finish_at_low_priority(monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_grace_seconds", 0.01)
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_policy", "finish")
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal())
+    release = asyncio.Event()
+
+    async def execute_until_released(_session) -> None:
+        await release.wait()
+
+    service = SessionLifecycleService(manager)
+    await service._start_session(session, execute_until_released)
+    await _wait_until(lambda: session.low_priority)
+
+    assert not session.task.done()
+    release.set()
+    await session.task
+    await asyncio.wait_for(asyncio.gather(*service._watchdogs), 1)
+
+
+@pytest.mark.asyncio
+async def test_returning_subscriber_restores_priority(monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_grace_seconds", 0.01)
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_policy", "finish")
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal())
+    release = asyncio.Event()
+
+    async def execute_until_released(_session) -> None:
+        await release.wait()
+        await _session.close()
+
+    service = SessionLifecycleService(manager)
+    await service._start_session(session, execute_until_released)
+    await _wait_until(lambda: session.low_priority)
+
+    subscriber = session.event_generator()
+    pending = asyncio.ensure_future(subscriber.__anext__())
+    await _wait_until(lambda: not session.low_priority)
+
+    pending.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await pending
+    await _wait_until(lambda: session.low_priority)
+
+    release.set()
+    await session.task
+    await asyncio.wait_for(asyncio.gather(*service._watchdogs), 1)
+
+
+@pytest.mark.asyncio
+async def test_viewer_on_another_worker_restores_priority(monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_grace_seconds", 0.01)
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_policy", "finish")
+    monkeypatch.setattr(lifecycle, "WATCHER_RECHECK_SECONDS", 0.01)
+    remote_watchers = 0
+
+    async def fake_count_session_watchers(session_id: str) -> int:
+        return remote_watchers
+
+    monkeypatch.setattr(lifecycle, "count_session_watchers", fake_count_session_watchers)
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal())
+    release = asyncio.Event()
+
+    async def execute_until_released(_session) -> None:
+        await release.wait()
+
+    service = SessionLifecycleService(manager)
+    await service._start_session(session, execute_until_released)
+    await _wait_until(lambda: session.low_priority)
+
+    remote_watchers = 1
+    await _wait_until(lambda: not session.low_priority)
+
+    release.set()
+    await session.task
+    await asyncio.wait_for(asyncio.gather(*service._watchdogs), 1)
+
+
+async def _wait_until(predicate, timeout: float = 1) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_watched_run_is_not_abandoned(monkeypatch) -> None:
+    monkeypatch.setattr(lifecycle.settings, "abandoned_session_grace_seconds", 0.01)
+    manager = SessionManager()
+    session = manager.create("session-1", make_proposal())
+    release = asyncio.Event()
+
+    async def execute_until_released(_session) -> None:
+        await release.wait()
+        await _session.close()
+
+    service = SessionLifecycleService(manager)
+    await service._start_session(session, execute_until_released)
+    subscriber = session.event_generator()
+    pending = asyncio.ensure_future(subscriber.__anext__())
+    await asyncio.sleep(0.05)
+
+    assert not session.task.done()
+    assert not session.low_priority
+    release.set()
+    await session.task
+    with pytest.raises(StopAsyncIteration):
+        await pending
+    await asyncio.gather(*service._watchdogs)
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.models.research import SSEEventType
+from app.models.session import SessionManager, SessionStatus
+from tests.test_session_events import make_proposal
+
+
+def test_get_expires_idle_sessions() -> None:
+    manager = SessionManager(idle_ttl_seconds=60)
+    session = manager.create("session-1", make_proposal())
+    session.last_accessed -= 61
+
+    assert manager.get("session-1") is None
+    assert manager.stats()["evictions"]["ttl"] == 1
+
+
+def test_create_evicts_least_recently_used_session() -> None:
+    manager = SessionManager(max_sessions=2)
+    manager.create("session-1", make_proposal())
+    manager.create("session-2", make_proposal())
+    manager.get("session-1")
+
+    manager.create("session-3", make_proposal())
+
+    assert manager.get("session-2") is None
+    assert manager.get("session-1") is not None
+    assert manager.get("session-3") is not None
+    assert manager.stats()["evictions"]["lru"] == 1
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_evicts_completed_sessions_but_keeps_running_ones() -> None:
+    manager = SessionManager(max_bytes=200)
+    running = manager.create("running", make_proposal(), status=SessionStatus.EXECUTING)
+    blocker = asyncio.Event()
+    running.task = asyncio.create_task(blocker.wait())
+    await running.push(SSEEventType.PROGRESS, {"message": "x" * 150})
+
+    completed = manager.create("completed", make_proposal(), status=SessionStatus.COMPLETED)
+    await completed.push(SSEEventType.COMPLETE, {"message": "y" * 150})
+    manager.create("fresh", make_proposal())
+
+    stats = manager.stats()
+    assert manager.get("completed") is None
+    assert manager.get("running") is running
+    assert stats["evictions"]["bytes"] == 1
+    assert stats["running"] == 1
+    assert stats["bytes"] == running.history_bytes
+
+    blocker.set()
+    await running.task
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_is_enforced_when_a_long_run_finishes() -> None:
+    manager = SessionManager(max_bytes=300)
+    idle = manager.create("idle", make_proposal(), status=SessionStatus.COMPLETED)
+    await idle.push(SSEEventType.COMPLETE, {"message": "y" * 100})
+    running = manager.create("running", make_proposal(), status=SessionStatus.EXECUTING)
+
+    async def run() -> None:
+        for _ in range(3):
+            await running.push(SSEEventType.PROGRESS, {"message": "x" * 30})
+        # Over budget now, but no other session is created afterwards.
+        assert manager.total_bytes > manager.max_bytes
+        await running.close()
+
+    running.task = asyncio.create_task(run())
+    await running.task
+    await asyncio.sleep(0)
+
+    assert manager.get("idle") is None
+    assert manager.get("running") is running
+    assert manager.stats()["evictions"]["bytes"] == 1
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def generate() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "proposal"
+
+    waiters = [asyncio.create_task(flights.do("en:iphone", generate)) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert flights.in_flight() == 1
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["proposal"] * 10
+    assert calls == 1
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+    release = asyncio.Event()
+
+    async def generate() -> str:
+        await release.wait()
+        return "proposal"
+
+    first = asyncio.create_task(flights.do("en:iphone", generate))
+    second = asyncio.create_task(flights.do("en:iphone", generate))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "proposal"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter_and_free_the_key() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+
+    async def fail() -> str:
+        await asyncio.sleep(0)
+        raise RuntimeError("llm unavailable")
+
+    results = await asyncio.gather(
+        flights.do("en:iphone", fail), flights.do("en:iphone", fail), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def succeed() -> str:
+        return "proposal"
+
+    assert await flights.do("en:iphone", succeed) == "proposal"
@@ -0,0 +1,46 @@
+import zlib
+
+import pytest
+
+from app.sse.compression import compressing_send, negotiate_encoding
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate, br", "gzip"),
+        ("deflate;q=0.9, gzip;q=0.5", "deflate"),
+        ("gzip;q=0, *", "deflate"),
+        ("br, *;q=0", None),
+    ],
+)
+def test_negotiate_encoding(header: str | None, expected: str | None) -> None:
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.asyncio
+async def test_compressing_send_flushes_each_event() -> None:
+    sent: list[dict] = []
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    wrapped = compressing_send(send, "gzip")
+    frames = [
+        b'id: e.%d\r\nevent: node_detail\r\ndata: {"node_id":"ms_001","details":{}}\r\n\r\n' % i
+        for i in range(1, 4)
+    ]
+    await wrapped({"type": "http.response.start", "status": 200, "headers": []})
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for frame in frames:
+        await wrapped({"type": "http.response.body", "body": frame, "more_body": True})
+        # Each event must be decodable on arrival, without waiting for later chunks.
+        assert decompressor.decompress(sent[-1]["body"]) == frame
+    await wrapped({"type": "http.response.body", "body": b"", "more_body": False})
+
+    decompressor.decompress(sent[-1]["body"])
+    assert decompressor.eof
+    assert sent[0]["type"] == "http.response.start"
+    assert sum(len(message["body"]) for message in sent[2:-1]) < sum(map(len, frames[1:]))
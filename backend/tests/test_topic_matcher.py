@@ -0,0 +1,107 @@
+import random
+import uuid
+
+import pytest
+
+from app.db import database, repository
+from app.db import redis as redis_store
+from app.db.topic_index import CachedTopicIndex
+from app.utils.topic_matcher import AhoCorasick, CachedTopicMatcher
+
+
+def test_automaton_finds_overlapping_patterns() -> None:
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+
+    assert automaton.find("ushers") == {"she", "he", "hers"}
+    assert automaton.find("this") == {"his"}
+    assert automaton.find("xyz") == set()
+
+
+def test_matcher_agrees_with_the_substring_rule() -> None:
+    rng = random.Random(7)
+    candidates = {"".join(rng.choices("abc ", k=rng.randint(1, 6))) for _ in range(40)}
+    cached = ["".join(rng.choices("abc ", k=rng.randint(1, 8))) for _ in range(60)]
+
+    matcher = CachedTopicMatcher(candidates)
+    matcher.reset(cached)
+
+    expected = {key for key in candidates if any(key in c or c in key for c in cached)}
+    assert matcher.covered(candidates) == expected
+
+
+def test_matcher_covers_both_directions() -> None:
+    matcher = CachedTopicMatcher({"iphone", "world war ii", "第二次世界大战"})
+
+    matcher.add("history of the iphone")
+    matcher.add("world war")
+
+    assert matcher.covered({"iphone", "world war ii", "第二次世界大战"}) == {
+        "iphone",
+        "world war ii",
+    }
+
+
+@pytest.mark.asyncio
+async def test_index_learns_topics_cached_by_other_workers(monkeypatch) -> None:
+    index = CachedTopicIndex({"bitcoin", "tesla"})
+    monkeypatch.setattr(redis_store, "cached_topic_index", index)
+    loads = 0
+
+    async def load_nothing() -> None:
+        nonlocal loads
+        loads += 1
+        index.loaded = True
+
+    monkeypatch.setattr(index, "_load", load_nothing)
+    assert await index.covered({"bitcoin", "tesla"}) == set()
+
+    redis_store.handle_invalidation(f"{redis_store.WORKER_ID}|cached_topic|{uuid.uuid4()}|tesla")
+    redis_store.handle_invalidation(f"otherworker|cached_topic|{uuid.uuid4()}|bitcoin history")
+
+    assert await index.covered({"bitcoin", "tesla"}) == {"bitcoin"}
+    assert loads == 1
+
+
+@pytest.mark.asyncio
+async def test_index_reloads_only_after_being_marked_stale(monkeypatch) -> None:
+    index = CachedTopicIndex({"bitcoin", "tesla"})
+    loads = 0
+
+    async def load_nothing() -> None:
+        nonlocal loads
+        loads += 1
+        index.loaded = True
+
+    monkeypatch.setattr(index, "_load", load_nothing)
+    for _ in range(3):
+        await index.covered({"bitcoin"})
+    assert loads == 1
+
+    index.mark_stale()
+    await index.covered({"bitcoin"})
+    assert loads == 2
+
+
+@pytest.mark.asyncio
+async def test_topics_saved_during_a_load_are_kept(monkeypatch) -> None:
+    index = CachedTopicIndex({"bitcoin", "tesla"})
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def fake_list_cached_topic_normalized(_db):
+        # save_research commits while the snapshot query is running.
+        index.add("tesla")
+        return ["bitcoin"]
+
+    monkeypatch.setattr(database, "async_session_factory", FakeSession)
+    monkeypatch.setattr(
+        repository, "list_cached_topic_normalized", fake_list_cached_topic_normalized
+    )
+
+    assert await index.covered({"bitcoin", "tesla"}) == {"bitcoin", "tesla"}
+    assert index.loaded
@@ -94,6 +94,7 @@ export function SessionView({ sessionId }: Props) {
     researchModel,
     onProgress,
     onSkeleton,
+    onSkeletonDelta,
     onNodeDetail,
     onSynthesis,
     onComplete,
@@ -329,6 +330,7 @@ export function SessionView({ sessionId }: Props) {
   useResearchStream(streamSessionId, {
     onProgress,
     onSkeleton,
+    onSkeletonDelta,
     onNodeDetail,
     onSynthesis,
     onComplete: useCallback((data: CompleteData) => {
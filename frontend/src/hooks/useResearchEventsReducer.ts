@@ -6,6 +6,7 @@ import type {
   NodeDetailEvent,
   NodeStatus,
   ProgressData,
+  SkeletonDeltaData,
   SkeletonNodeData,
   SynthesisData,
   TimelineNode,
@@ -33,6 +34,7 @@ const STATUS_RANK: Record<NodeStatus, number> = {
 export type ResearchEventsAction =
   | { type: "progress"; data: ProgressData }
   | { type: "skeleton"; data: SkeletonEventData }
+  | { type: "skeleton_delta"; data: SkeletonDeltaData }
   | { type: "node_detail"; data: NodeDetailEvent }
   | { type: "synthesis"; data: SynthesisData }
   | { type: "complete"; data: CompleteData };
@@ -88,6 +90,31 @@ function replaceSkeletonNodes(
   });
 }
 
+function applySkeletonDelta(
+  currentNodes: TimelineNode[],
+  delta: SkeletonDeltaData,
+): TimelineNode[] {
+  const removed = new Set(delta.removed ?? []);
+  const changedById = new Map((delta.changed ?? []).map((node) => [node.id, node]));
+  const nodes: TimelineNode[] = [];
+  for (const node of currentNodes) {
+    if (removed.has(node.id)) continue;
+    const changes = changedById.get(node.id);
+    nodes.push(changes ? { ...node, ...changes } : node);
+  }
+  for (const node of delta.added ?? []) {
+    nodes.push({ ...node });
+  }
+  if (!delta.order) return nodes;
+
+  const position = new Map(delta.order.map((id, index) => [id, index]));
+  return nodes.sort(
+    (a, b) =>
+      (position.get(a.id) ?? Number.MAX_SAFE_INTEGER) -
+      (position.get(b.id) ?? Number.MAX_SAFE_INTEGER),
+  );
+}
+
 export function researchEventsReducer(
   state: ResearchEventsState,
   action: ResearchEventsAction,
@@ -119,6 +146,12 @@ export function researchEventsReducer(
           : replaceSkeletonNodes(state.nodes, action.data.nodes),
       };
 
+    case "skeleton_delta":
+      return {
+        ...state,
+        nodes: applySkeletonDelta(state.nodes, action.data),
+      };
+
     case "node_detail":
       return {
         ...state,
@@ -165,6 +198,10 @@ export function useResearchEventsReducer() {
       (data: SkeletonEventData) => dispatch({ type: "skeleton", data }),
       [],
     ),
+    onSkeletonDelta: useCallback(
+      (data: SkeletonDeltaData) => dispatch({ type: "skeleton_delta", data }),
+      [],
+    ),
     onNodeDetail: useCallback(
       (data: NodeDetailEvent) => dispatch({ type: "node_detail", data }),
       [],
@@ -5,7 +5,9 @@ import type {
   ProgressData,
   NodeProgressData,
   SkeletonNodeData,
+  SkeletonDeltaData,
   NodeDetailEvent,
+  NodeBatchData,
   SynthesisData,
   CompleteData,
 } from "@/types";
@@ -14,6 +16,7 @@ interface StreamCallbacks {
   onProgress?: (data: ProgressData) => void;
   onNodeProgress?: (data: NodeProgressData) => void;
   onSkeleton?: (data: { nodes: SkeletonNodeData[]; partial?: boolean }) => void;
+  onSkeletonDelta?: (data: SkeletonDeltaData) => void;
   onNodeDetail?: (data: NodeDetailEvent) => void;
   onSynthesis?: (data: SynthesisData) => void;
   onComplete?: (data: CompleteData) => void;
@@ -38,16 +41,22 @@ export function useResearchStream(
     let attempt = 0;
     let closed = false;
     let retryTimer: ReturnType<typeof setTimeout> | null = null;
+    let lastEventId = "";
 
     function connect() {
       if (closed) return;
-      const es = new EventSource(`/api/research/${sessionId}/stream`);
+      const resume = lastEventId
+        ? `?last_event_id=${encodeURIComponent(lastEventId)}`
+        : "";
+      const es = new EventSource(`/api/research/${sessionId}/stream${resume}`);
       esRef.current = es;
 
       function listen<T>(event: string, handler: (data: T) => void) {
         es.addEventListener(event, (e) => {
+          const message = e as MessageEvent;
+          if (message.lastEventId) lastEventId = message.lastEventId;
           try {
-            handler(JSON.parse((e as MessageEvent).data));
+            handler(JSON.parse(message.data));
           } catch {
             /* malformed JSON — ignore */
           }
@@ -61,9 +70,18 @@ export function useResearchStream(
       listen<{ nodes: SkeletonNodeData[]; partial?: boolean }>("skeleton", (d) =>
         cbRef.current.onSkeleton?.(d),
       );
+      listen<SkeletonDeltaData>("skeleton_delta", (d) =>
+        cbRef.current.onSkeletonDelta?.(d),
+      );
       listen<NodeDetailEvent>("node_detail", (d) =>
         cbRef.current.onNodeDetail?.(d),
       );
+      // Bursts of node events are coalesced server-side; React batches the
+      // resulting state updates since they run in one event handler.
+      listen<NodeBatchData>("node_batch", (d) => {
+        d.progress.forEach((p) => cbRef.current.onNodeProgress?.(p));
+        d.details.forEach((detail) => cbRef.current.onNodeDetail?.(detail));
+      });
       listen<SynthesisData>("synthesis", (d) =>
         cbRef.current.onSynthesis?.(d),
       );
@@ -82,6 +82,13 @@ export interface SkeletonNodeData {
   is_gap_node?: boolean;
 }
 
+export interface SkeletonDeltaData {
+  added?: SkeletonNodeData[];
+  removed?: string[];
+  changed?: (Partial<SkeletonNodeData> & { id: string })[];
+  order?: string[];
+}
+
 export interface NodeDetailData {
   key_features: string[];
   impact: string;
@@ -99,6 +106,11 @@ export interface NodeDetailEvent {
   details: NodeDetailData;
 }
 
+export interface NodeBatchData {
+  progress: NodeProgressData[];
+  details: NodeDetailEvent[];
+}
+
 export interface TimelineConnection {
   from_id: string;
   to_id: string;
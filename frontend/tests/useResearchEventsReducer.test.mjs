@@ -186,4 +186,40 @@ describe("researchEventsReducer", () => {
       "https://example.com/detail",
     ]);
   });
+
+  it("applies skeleton deltas without dropping completed details", () => {
+    const state = researchEventsReducer(
+      researchEventsReducer(createInitialResearchEventsState(), {
+        type: "skeleton",
+        data: {
+          nodes: [
+            skeletonNode(),
+            skeletonNode({ id: "ms_002", date: "2008-07-11" }),
+          ],
+        },
+      }),
+      {
+        type: "node_detail",
+        data: { node_id: "ms_001", details: detail() },
+      },
+    );
+
+    const next = researchEventsReducer(state, {
+      type: "skeleton_delta",
+      data: {
+        added: [skeletonNode({ id: "ms_003", date: "2006-01-01" })],
+        removed: ["ms_002"],
+        changed: [{ id: "ms_001", date: "2007-01-10" }],
+        order: ["ms_003", "ms_001"],
+      },
+    });
+
+    assert.deepEqual(
+      next.nodes.map((node) => node.id),
+      ["ms_003", "ms_001"],
+    );
+    assert.equal(next.nodes[1].date, "2007-01-10");
+    assert.equal(next.nodes[1].status, "complete");
+    assert.equal(next.nodes[1].details?.impact, "It reshaped smartphones.");
+  });
 });